@@ -1,7 +1,7 @@
-# 本番環境で呼び出されてもエラーにならないようにする
-try:
-    import pytest
+import sys
 
+# テスト(pytest)の実行中のみ、GenericTest* のassertを書き換える
+# (本番環境やワーカーの起動時に、pytestを読み込まないようにする)
+pytest = sys.modules.get("pytest")
+if pytest is not None:
     pytest.register_assert_rewrite("apps.libs.tests")
-except ModuleNotFoundError:  # pragma: no cover
-    pass
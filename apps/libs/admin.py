@@ -3,12 +3,13 @@ from typing import Type
 
 from django.contrib import admin
 from django.db import models
-from django.db.models import Field
 from django.db.models import Field as ModelField
-from django.db.models import ManyToManyField, URLField
+from django.db.models import URLField
 from django.forms import Field as FormField
 from django.forms import Textarea
 
+from apps.libs.db.introspection import get_model_descriptor
+
 
 class MyAdmin(admin.ModelAdmin):
     """maxlengthに合わせて幅を伸び縮みさせるModelAdmin"""
@@ -33,19 +34,8 @@ class MyAdmin(admin.ModelAdmin):
 
 
 def get_model_fields_for_admin(cls: Type[models.Model]):
-    """管理画面用にモデルからフィールドを取得する"""
-    result = []
-    for f in cls._meta.get_fields():  # type: Field
-        if f.auto_created:
-            continue
-
-        # ManyToManyFieldはそのまま表示できないため対象外
-        if isinstance(f, ManyToManyField):
-            continue
-
-        result.append(f.name)
-
-    return result
+    """管理画面用にモデルからフィールドを取得する(ManyToManyFieldはそのまま表示できないため対象外)"""
+    return list(get_model_descriptor(cls).admin_fields)
 
 
 def register_admin(cls, list_display=None):
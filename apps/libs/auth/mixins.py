@@ -1,19 +1,36 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
-from social_django.models import UserSocialAuth
+from django.core.exceptions import ObjectDoesNotExist
 
 
 class Auth0LoginRequiredMixin(LoginRequiredMixin):
     def dispatch(self, request, *args, **kwargs):
+        # 非同期のViewでは非同期のORMで確認する
+        # noinspection PyUnresolvedReferences
+        if self.view_is_async:
+            return self._adispatch(request, *args, **kwargs)
+
         try:
             if not request.user.is_authenticated:
                 return self.handle_no_permission()
 
             request.user.social_auth.get(provider="auth0")
-        except UserSocialAuth.DoesNotExist:
+        except ObjectDoesNotExist:
+            # UserSocialAuth.DoesNotExist(social_djangoのモデルは、ここでは読み込まない)
             return self.handle_no_permission()
 
         return super().dispatch(request, *args, **kwargs)
 
+    async def _adispatch(self, request, *args, **kwargs):
+        # 以降の(同期の) request.user の参照でDBにアクセスしないよう、取得済みのユーザーに置き換える
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+
+        if not await request.user.social_auth.filter(provider="auth0").aexists():
+            return self.handle_no_permission()
+
+        return await super().dispatch(request, *args, **kwargs)
+
 
 class NotRestrictedMixin:
     """アクセス制限がかかっていないことを表すMixin"""
@@ -1,5 +1,30 @@
+from collections import Counter
+
+from django.db.models import QuerySet
+
+
 def duplicated_objects(object_list):
-    return [x for x in set(object_list) if object_list.count(x) > 1]
+    """2回以上現れる要素を、最初に現れた順に返す"""
+    return [x for x, count in Counter(object_list).items() if count > 1]
+
+
+def iter_duplicated_objects(iterable):
+    """2回目に現れた時点で、重複している要素を(1回だけ)返す
+
+    リストにせずに順に読むため、イテレーターやQuerySet(iterator()で読む)の大量の行にも使える。
+    """
+    # QuerySetの場合は、結果をキャッシュしないように読む
+    if isinstance(iterable, QuerySet):
+        iterable = iterable.iterator()
+
+    seen = set()
+    reported = set()
+    for x in iterable:
+        if x not in seen:
+            seen.add(x)
+        elif x not in reported:
+            reported.add(x)
+            yield x
 
 
 def as_list(x):
@@ -0,0 +1,100 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.urls import get_script_prefix, get_urlconf, set_script_prefix, set_urlconf
+from django.utils import timezone, translation
+
+# 並行して実行するスレッド数のデフォルト(settings.CONCURRENT_QUERY_MAX_WORKERS で変更できる)
+DEFAULT_MAX_WORKERS = 4
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """プロセス内で共有するスレッドプールを返す"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                max_workers = getattr(settings, "CONCURRENT_QUERY_MAX_WORKERS", DEFAULT_MAX_WORKERS)
+                _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="concurrent-query")
+
+    return _executor
+
+
+@dataclass(frozen=True)
+class RequestLocals:
+    """リクエスト中にスレッドローカル(asgirefのLocal)で保持される設定
+
+    スレッドプールのワーカーには引き継がれないため、呼び出し元で取得してワーカーで有効にする。
+    """
+
+    language: Optional[str]
+    timezone: Any
+    urlconf: Optional[str]
+    script_prefix: str
+
+    @classmethod
+    def capture(cls) -> "RequestLocals":
+        return cls(
+            language=translation.get_language(),
+            timezone=timezone.get_current_timezone(),
+            urlconf=get_urlconf(),
+            script_prefix=get_script_prefix(),
+        )
+
+    @contextmanager
+    def activate(self):
+        # ワーカーのスレッドは使い回されるため、終わったら元に戻す
+        old_urlconf, old_script_prefix = get_urlconf(), get_script_prefix()
+        set_urlconf(self.urlconf)
+        set_script_prefix(self.script_prefix)
+        try:
+            with translation.override(self.language), timezone.override(self.timezone):
+                yield
+        finally:
+            set_urlconf(old_urlconf)
+            set_script_prefix(old_script_prefix)
+
+
+def _run_in_thread(func: Callable, request_locals: RequestLocals):
+    # ワーカーのDB接続は、リクエストと同じく CONN_MAX_AGE に従って使い回す
+    # (スレッド数は上限があるため、接続数もワーカーの数までに収まる)
+    close_old_connections()
+    try:
+        with request_locals.activate():
+            return func()
+    finally:
+        close_old_connections()
+
+
+def _in_atomic_block() -> bool:
+    return any(connections[alias].in_atomic_block for alias in connections)
+
+
+def run_concurrently(tasks: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+    """互いに依存しない処理(主にクエリ)を並行して実行し、{キー: 結果} を返す
+
+    別スレッドからはコミット前のデータが見えないため、トランザクション中は順番に実行する。
+    言語、タイムゾーン、URLconf、スクリプトのプレフィックスは、呼び出し元と同じものが有効になる。
+    """
+    if len(tasks) <= 1 or _in_atomic_block():
+        return {key: func() for key, func in tasks.items()}
+
+    # 1つ目は呼び出し元のスレッドで実行する
+    (first_key, first_func), *rest = tasks.items()
+    executor = get_executor()
+    request_locals = RequestLocals.capture()
+    futures = {key: executor.submit(_run_in_thread, func, request_locals) for key, func in rest}
+
+    results = {first_key: first_func()}
+    for key, future in futures.items():
+        results[key] = future.result()
+
+    return results
@@ -1,16 +1,79 @@
-from datetime import datetime, time
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from datetime import tzinfo
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
 
-import pytz
-from babel import Locale
-from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.utils import timezone
 from django.utils.timezone import make_aware
 
-JAPAN_STANDARD_TIME = pytz.timezone("Asia/Tokyo")
+JAPAN_STANDARD_TIME = ZoneInfo("Asia/Tokyo")
+
+
+# 曜日・月の名前のデフォルトのロケール
+DEFAULT_LOCALE = "ja_JP"
+# babelの幅の名前("short"は曜日のみ)
+WEEKDAY_WIDTHS = ("narrow", "short", "abbreviated", "wide")
+MONTH_WIDTHS = ("narrow", "abbreviated", "wide")
+
+# (ロケール, "days" または "months", 幅) -> 名前のタプル(曜日は月曜日から、月は1月から)
+_NAMES: Dict[Tuple[str, str, str], Tuple[str, ...]] = {}
+
+
+def _get_names(locale: str, kind: str, width: str) -> Tuple[str, ...]:
+    key = (locale, kind, width)
+    names = _NAMES.get(key)
+    if names is None:
+        # babelは読み込みに時間がかかるため、使うときに読み込む
+        from babel import Locale
+
+        format_names = getattr(Locale.parse(locale), kind)["format"][width]
+        names = _NAMES[key] = tuple(format_names[i] for i in (range(7) if kind == "days" else range(1, 13)))
+
+    return names
+
+
+def preload_names(locales: Optional[Iterable[str]] = None):
+    """曜日・月の名前をまとめて読み込んでおく(ワーカーの起動時などに呼ぶ)
+
+    ロケールの指定がない場合は settings.DATETIME_NAME_LOCALES (デフォルトは ja_JP のみ)。
+    """
+    if locales is None:
+        locales = getattr(settings, "DATETIME_NAME_LOCALES", (DEFAULT_LOCALE,))
+
+    for locale in locales:
+        for width in WEEKDAY_WIDTHS:
+            _get_names(locale, "days", width)
+        for width in MONTH_WIDTHS:
+            _get_names(locale, "months", width)
+
+
+def get_weekday_names(width: str = "narrow", locale: str = DEFAULT_LOCALE) -> Tuple[str, ...]:
+    """月曜日から日曜日までの曜日の名前(date.weekday()で引ける)"""
+    return _get_names(locale, "days", width)
+
+
+def get_month_names(width: str = "wide", locale: str = DEFAULT_LOCALE) -> Tuple[str, ...]:
+    """1月から12月までの月の名前(month - 1で引ける)"""
+    return _get_names(locale, "months", width)
 
 
 def get_short_weekday(weekday: int):
-    return Locale("ja", "JP").days["format"]["narrow"][weekday]
+    return get_weekday_names("narrow")[weekday]
+
+
+def label_weekdays(dates: Sequence[date], width: str = "narrow", locale: str = DEFAULT_LOCALE) -> List[str]:
+    """日付のリストをまとめて曜日の名前にする"""
+    names = get_weekday_names(width, locale)
+    return [names[d.weekday()] for d in dates]
+
+
+def label_months(dates: Sequence[date], width: str = "wide", locale: str = DEFAULT_LOCALE) -> List[str]:
+    """日付のリストをまとめて月の名前にする"""
+    names = get_month_names(width, locale)
+    return [names[d.month - 1] for d in dates]
 
 
 def local_now():
@@ -22,7 +85,7 @@ def local_today():
 
 
 def local_tomorrow():
-    return timezone.localdate() + relativedelta(days=1)
+    return timezone.localdate() + timedelta(days=1)
 
 
 def local_today_datetime():
@@ -31,4 +94,113 @@ def local_today_datetime():
 
 
 def make_jst(value):
-    return make_aware(value, timezone=JAPAN_STANDARD_TIME).astimezone(pytz.UTC)
+    return make_aware(value, timezone=JAPAN_STANDARD_TIME).astimezone(dt_timezone.utc)
+
+
+def make_jst_many(values: Iterable[datetime]) -> List[datetime]:
+    """make_jst() をまとめて行う(日本時間のnaiveなdatetimeを、UTCのawareなdatetimeにする)
+
+    make_jst() と同じく、awareなdatetimeの場合はValueErrorになる。
+    """
+    results = []
+    for value in values:
+        if value.tzinfo is not None:
+            raise ValueError(f"Not naive datetime (tzinfo is already set): {value}")
+
+        results.append(value.replace(tzinfo=JAPAN_STANDARD_TIME).astimezone(dt_timezone.utc))
+
+    return results
+
+
+def localize_many(values: Iterable[Optional[datetime]], tz: Optional[tzinfo] = None) -> List[Optional[datetime]]:
+    """awareなdatetimeをまとめて現在のタイムゾーン(またはtz)の時刻にする(Noneはそのまま)
+
+    1件ずつ timezone.localtime() を呼ぶと、毎回タイムゾーンの取得と検証が行われるため、それらを1回にまとめる。
+    """
+    tz = tz or timezone.get_current_timezone()
+    results = []
+    for value in values:
+        if value is None:
+            results.append(None)
+        elif value.tzinfo is None:
+            raise ValueError("naiveなdatetimeは変換できません。")
+        else:
+            results.append(value.astimezone(tz))
+
+    return results
+
+
+def local_dates(values: Iterable[Optional[datetime]], tz: Optional[tzinfo] = None) -> List[Optional[date]]:
+    """awareなdatetimeをまとめて現在のタイムゾーン(またはtz)の日付にする(Noneはそのまま)"""
+    return [value.date() if value else None for value in localize_many(values, tz)]
+
+
+def bucket_by_month(
+    objects: Iterable, key: Optional[Callable] = None, tz: Optional[tzinfo] = None
+) -> Dict[Tuple[int, int], list]:
+    """オブジェクトを、key(obj)の日時(または日付)の (年, 月) ごとに分ける(月は現在のタイムゾーン、またはtzで決める)
+
+    月の順番は、最初に現れた順になる。key(obj)がNoneのオブジェクトは含めない。
+    """
+    tz = tz or timezone.get_current_timezone()
+    buckets = {}
+    for obj in objects:
+        value = key(obj) if key else obj
+        if value is None:
+            continue
+
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                raise ValueError("naiveなdatetimeは変換できません。")
+            value = value.astimezone(tz)
+
+        buckets.setdefault((value.year, value.month), []).append(obj)
+
+    return buckets
+
+
+def _utc_day_offset(tz: tzinfo, day: date) -> Optional[timedelta]:
+    """UTCでのその日の間、タイムゾーンのオフセットが変わらなければそのオフセットを、変わる(切り替わりがある)ならNoneを返す"""
+    start = datetime.combine(day, time(), tzinfo=dt_timezone.utc)
+    end = start + timedelta(days=1, microseconds=-1)
+    offset = start.astimezone(tz).utcoffset()
+    return offset if end.astimezone(tz).utcoffset() == offset else None
+
+
+def localize_datetime64(values, tz: Optional[tzinfo] = None):
+    """UTCのdatetime64の配列を、現在のタイムゾーン(またはtz)の時刻のdatetime64の配列にする(要NumPy)
+
+    オフセットは(UTCでの)日ごとに1回だけ求め、切り替わりのある日のみ1件ずつ変換する。
+    月ごとに分けるには、結果を `.astype("datetime64[M]")` する。
+    """
+    # NumPyは読み込みに時間がかかり、必須でもないため、使うときに読み込む
+    try:
+        import numpy as np
+    except ModuleNotFoundError:  # pragma: no cover
+        raise ImproperlyConfigured("localize_datetime64() を使うには、NumPyをインストールしてください。")
+
+    tz = tz or timezone.get_current_timezone()
+    values = np.asarray(values, dtype="datetime64[us]")
+    days, inverse = np.unique(values.astype("datetime64[D]"), return_inverse=True)
+
+    offsets = np.zeros(len(days), dtype="timedelta64[us]")
+    transition_days = np.zeros(len(days), dtype=bool)
+    for i, day in enumerate(days.tolist()):
+        # NaTはそのまま
+        if day is None:
+            continue
+
+        offset = _utc_day_offset(tz, day)
+        if offset is None:
+            transition_days[i] = True
+        else:
+            offsets[i] = offset
+
+    results = values + offsets[inverse]
+
+    # 切り替わりのある日は1件ずつ変換する
+    for i in np.flatnonzero(transition_days[inverse]):
+        value = values[i].item().replace(tzinfo=dt_timezone.utc)
+        results[i] = np.datetime64(value.astimezone(tz).replace(tzinfo=None), "us")
+
+    return results
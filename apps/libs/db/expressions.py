@@ -0,0 +1,39 @@
+from django.db.models import Expression, IntegerField, Model
+
+
+class ValuesPosition(Expression):
+    """VALUESリストの (値, 位置) と突き合わせて、式の値の位置(0始まり)を返す式
+
+    Case(When(...)) と違って値ごとに分岐を作らないため、値が多い場合でもSQLが小さく済む。
+    VALUESリストの列名(column1, column2)に依存するため、PostgreSQLとSQLiteのみ対応。
+    """
+
+    template = "(SELECT column2 FROM (VALUES %(values)s) AS custom_order_values WHERE column1 = %(expression)s)"
+
+    def __init__(self, expression, values):
+        super().__init__(output_field=IntegerField())
+        self.source_expression = expression
+        self.values = tuple(values)
+
+    def get_source_expressions(self):
+        return [self.source_expression]
+
+    def set_source_expressions(self, exprs):
+        (self.source_expression,) = exprs
+
+    def as_sql(self, compiler, connection):
+        expression_sql, params = compiler.compile(self.source_expression)
+
+        # 比較対象の列の型に合わせて値を変換しておく
+        # 同じ値が複数ある場合は、Case(When(...))と同じく最初の位置だけを残す(サブクエリが複数行を返さないように)
+        output_field = self.source_expression.output_field
+        positions = {}
+        for index, value in enumerate(self.values):
+            db_value = output_field.get_db_prep_value(value.pk if isinstance(value, Model) else value, connection)
+            positions.setdefault(db_value, index)
+
+        values_sql = ", ".join(f"(%s, {index})" for index in positions.values())
+        values_params = list(positions)
+
+        sql = self.template % {"values": values_sql, "expression": expression_sql}
+        return sql, (*values_params, *params)
@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import FrozenSet, Mapping, Tuple, Type
+
+from django.db import models
+from django.db.models import (
+    Field,
+    FileField,
+    ForeignObjectRel,
+    ManyToManyField,
+    ManyToManyRel,
+    ManyToOneRel,
+)
+
+
+@dataclass(frozen=True)
+class ModelDescriptor:
+    """モデルの _meta から取り出した情報をまとめたもの(モデルごとに1度だけ作成)"""
+
+    model: Type[models.Model]
+    # 順方向の実フィールド(_meta.fields)
+    fields: Tuple[Field, ...]
+    # 親クラスへのポインタ(*_ptr)を除いた、表示用のフィールド
+    display_fields: Tuple[Field, ...]
+    # 自動生成されていない(モデルで宣言した)フィールド名
+    # editable=Falseのフィールド(auto_nowなど)も含む
+    declared_fields: Tuple[str, ...]
+    # 管理画面で表示できるフィールド名(declared_fieldsからManyToManyFieldを除いたもの)
+    admin_fields: Tuple[str, ...]
+    # フィールド名 => {値: ラベル}
+    choices: Mapping[str, Mapping]
+    file_fields: FrozenSet[str]
+    # 子モデルへの逆参照(親へのリンクを除く)
+    reverse_relations: Tuple[ForeignObjectRel, ...]
+
+
+@lru_cache(maxsize=None)
+def get_model_descriptor(cls: Type[models.Model]) -> ModelDescriptor:
+    """モデルの情報を返す。
+
+    逆参照を含めるため、アプリケーションの読み込み(apps.ready)後に呼び出すこと。
+    """
+    all_fields = cls._meta.get_fields()
+    fields = tuple(cls._meta.fields)
+    declared_fields = tuple(f for f in all_fields if not f.auto_created)
+
+    return ModelDescriptor(
+        model=cls,
+        fields=fields,
+        display_fields=tuple(f for f in fields if not f.name.endswith("_ptr")),
+        declared_fields=tuple(f.name for f in declared_fields),
+        admin_fields=tuple(f.name for f in declared_fields if not isinstance(f, ManyToManyField)),
+        choices=MappingProxyType({f.name: MappingProxyType(dict(f.flatchoices)) for f in fields if f.choices}),
+        file_fields=frozenset(f.name for f in fields if isinstance(f, FileField)),
+        reverse_relations=tuple(
+            f for f in all_fields if isinstance(f, (ManyToOneRel, ManyToManyRel)) and not f.parent_link
+        ),
+    )
@@ -2,7 +2,9 @@ from typing import Type
 
 from django import forms
 from django.db import models
-from django.db.models import CharField, Field, PositiveSmallIntegerField
+from django.db.models import CharField, PositiveSmallIntegerField
+
+from apps.libs.db.introspection import get_model_descriptor
 
 
 class NoteField(CharField):
@@ -43,14 +45,7 @@ class IntegerChoiceField(PositiveSmallIntegerField):
 
 
 def get_model_fields(cls: Type[models.Model]):
-    result = []
-    for f in cls._meta.get_fields():  # type: Field
-        if f.auto_created:
-            continue
-
-        result.append(f.name)
-
-    return result
+    return list(get_model_descriptor(cls).declared_fields)
 
 
 def get_raw_verbose_name(cls: Type[models.Model], field_name: str):
@@ -1,6 +1,123 @@
+from dataclasses import dataclass
+from functools import lru_cache
 from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional
 
-from django.db.models import Case, IntegerField, Max, Sum, Value, When
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    ForeignObjectRel,
+    IntegerField,
+    Max,
+    OuterRef,
+    QuerySet,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+
+from apps.libs.db.expressions import ValuesPosition
+
+# これより多い値でソートする場合は、Case(When(...))ではなくVALUESリストと突き合わせる
+CUSTOM_ORDER_CASE_MAX_LENGTH = 20
+
+# VALUESリストによるカスタムソートに対応しているDB
+CUSTOM_ORDER_VALUES_VENDORS = ("postgresql", "sqlite")
+
+
+def _is_unevaluated(qs) -> bool:
+    """まだ評価されていない(結果がキャッシュされていない)QuerySetかどうか"""
+    return isinstance(qs, QuerySet) and qs._result_cache is None
+
+
+def _is_concrete_field(model, key: str) -> bool:
+    """keyがモデルの(リレーションでない)実フィールドかどうか"""
+    try:
+        field = model._meta.get_field(key)
+    except FieldDoesNotExist:
+        return False
+
+    return field.concrete and not field.is_relation
+
+
+def _is_forward_relation(field) -> bool:
+    # 逆参照や多対多は複数の値になるため対象外
+    return field.concrete and (field.many_to_one or field.one_to_one)
+
+
+def _get_forward_field(model, key: str):
+    """順方向の外部キーだけをたどってkey(例: parent__name)のフィールドを返す(たどれない場合はNone)"""
+    field = None
+    for name in key.split("__"):
+        if field is not None:
+            if not _is_forward_relation(field):
+                return None
+            model = field.related_model
+
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+
+    return field
+
+
+def _is_forward_field_path(model, key: str) -> bool:
+    """keyが順方向の外部キーをたどって実フィールドに行き着くパス(例: parent__name)かどうか"""
+    field = _get_forward_field(model, key)
+    return field is not None and field.concrete and not field.is_relation
+
+
+def _flatten_select_related(select_related: dict, prefix="") -> list:
+    names = []
+    for name, children in select_related.items():
+        names.append(prefix + name)
+        names.extend(_flatten_select_related(children, prefix + name + "__"))
+
+    return names
+
+
+def qs_only(qs, keys):
+    """keysのフィールドだけを取得する(parent__name のように外部キーをたどる場合は select_related する)
+
+    モデルのフィールドでないもの(プロパティやメソッド)は無視する。
+    """
+    only_fields = []
+    related_names = []
+    for key in keys:
+        field = _get_forward_field(qs.model, key)
+        if field is None:
+            continue
+
+        only_fields.append(key)
+        if _is_forward_relation(field):
+            # 外部キーそのものを表示する場合は関連オブジェクトも取得する
+            related_names.append(key)
+        elif "__" in key:
+            related_names.append(key.rsplit("__", 1)[0])
+
+    # select_related() (引数なし)の場合は、たどるフィールドが分からないためそのまま
+    if not only_fields or qs.query.select_related is True:
+        return qs
+
+    # すでに select_related しているフィールドを遅延させるとエラーになるため含める
+    if qs.query.select_related:
+        only_fields.extend(_flatten_select_related(qs.query.select_related))
+
+    if related_names:
+        qs = qs.select_related(*related_names)
+
+    return qs.only(*only_fields)
+
+
+def qs_is_aggregatable(qs, key: str) -> bool:
+    """DB側で集計できるかどうか(未評価のQuerySetで、keyがモデルのフィールドの場合)"""
+    return _is_unevaluated(qs) and _is_concrete_field(qs.model, key)
 
 
 def qs_total(qs, key):
@@ -12,17 +129,42 @@ def qs_max(qs, key):
 
 
 def qs_total_client_side(qs, key):
+    # 未評価のQuerySetでモデルのフィールドの場合は、インスタンスを作らずにDBで集計する
+    if qs_is_aggregatable(qs, key):
+        return qs_total(qs, key)
+
     return sum(getattr(record, key) for record in qs)
 
 
+def _get_ordering(qs) -> tuple:
+    """QuerySetの現在の並び順(指定がなければpk)"""
+    if qs.query.order_by:
+        return tuple(qs.query.order_by)
+    if qs.query.default_ordering and qs.model._meta.ordering:
+        return tuple(qs.model._meta.ordering)
+
+    return ("pk",)
+
+
 def qs_last_by(qs, key: str):
-    """QuerySetをローカルでkeyでソートして最後のインスタンスを返す"""
+    """QuerySetをkeyでソートして最後のインスタンスを返す(同じ値の場合は、元の並び順で最後のもの)"""
+    # 未評価のQuerySetでモデルのフィールドの場合は、DB側でソートして1件だけ取得する
+    # (スライス済みのQuerySetは並び替えられないため除く)
+    if _is_unevaluated(qs) and not qs.query.is_sliced and _is_concrete_field(qs.model, key):
+        return qs.order_by(key, *_get_ordering(qs)).last()
+
+    # 評価済みの場合はキャッシュを使ってローカルでソート
     sorted_qs = sorted(qs, key=attrgetter(key))
     return sorted_qs[-1] if sorted_qs else None
 
 
 def qs_value_list_flat_client_side(qs, key):
     """values_list(key, flat=True)"""
+    # 未評価のQuerySetの場合は、外部キーをたどる分もまとめてDB側で取得する
+    if _is_unevaluated(qs) and _is_forward_field_path(qs.model, key):
+        return list(qs.values_list(key, flat=True))
+
+    # 評価済みの場合はキャッシュを使ってローカルで取得
     result = []
     for obj in qs:
         attr_name_list = key.split("__")
@@ -33,7 +175,10 @@ def qs_value_list_flat_client_side(qs, key):
     return result
 
 
-def qs_custom_order(qs, key: str, sort_order: tuple):
+def _build_custom_order(key: str, sort_order: tuple, use_values: bool):
+    if use_values:
+        return ValuesPosition(F(key), sort_order)
+
     cases = []
     for index, value in enumerate(sort_order):
         when_params = {
@@ -42,8 +187,108 @@ def qs_custom_order(qs, key: str, sort_order: tuple):
         }
         cases.append(When(**when_params))
 
-    return qs.annotate(custom_order=Case(*cases, output_field=IntegerField())).order_by("custom_order")
+    return Case(*cases, output_field=IntegerField())
+
+
+# 式はannotate()時にコピーされるため、同じ (key, sort_order) であれば使い回せる
+_cached_custom_order = lru_cache(maxsize=128)(_build_custom_order)
+
+
+def _is_hashable(value) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+
+    return True
+
+
+def qs_custom_order(qs, key: str, sort_order: tuple):
+    sort_order = tuple(sort_order)
+    hashable = _is_hashable(sort_order)
+
+    # VALUESリストは `=` で比較するためNULLと一致せず(Case(When(...))は IS NULL になる)、
+    # 同じ値を除くために値をハッシュするため、Noneやハッシュできない値が含まれている場合はCase(When(...))を使う
+    use_values = (
+        len(sort_order) > CUSTOM_ORDER_CASE_MAX_LENGTH
+        and connections[qs.db].vendor in CUSTOM_ORDER_VALUES_VENDORS
+        and hashable
+        and all(value is not None for value in sort_order)
+    )
+
+    if hashable:
+        custom_order = _cached_custom_order(key, sort_order, use_values)
+    else:
+        # ハッシュできない値が含まれている場合はキャッシュしない
+        custom_order = _build_custom_order(key, sort_order, use_values)
+
+    return qs.annotate(custom_order=custom_order).order_by("custom_order")
 
 
 def qs_split(qs_split_func):
     return qs_split_func(True), qs_split_func(False)
+
+
+@dataclass
+class KeysetPage:
+    object_list: List
+    # 次のページを取得するときに after に渡すpk(最後のページの場合はNone)
+    next_after: Optional[Any]
+
+
+def qs_keyset_page(qs, after=None, size: int = 50) -> KeysetPage:
+    """pkの昇順で、after より後ろを size 件取得する(OFFSETを使わないため、後ろのページでも遅くならない)"""
+    qs = qs.order_by("pk")
+    if after is not None:
+        qs = qs.filter(pk__gt=after)
+
+    # 次のページがあるかどうかを判定するため、1件多く取得する
+    rows = list(qs[: size + 1])
+    object_list = rows[:size]
+    if len(rows) <= size:
+        return KeysetPage(object_list=object_list, next_after=None)
+
+    last = object_list[-1]
+    return KeysetPage(object_list=object_list, next_after=last["pk"] if isinstance(last, dict) else last.pk)
+
+
+def qs_duplicated_values(qs, *fields: str, count_name: str = "duplicate_count") -> QuerySet:
+    """fieldsの値の組み合わせが重複しているものを、DB側で集計して返す
+
+    `[{"name": "a", "duplicate_count": 2}, ...]` の形式(fieldsの昇順)。
+    件数の名前がモデルのフィールドと重なる場合は、count_nameで変更する。
+    """
+    # スライス済みのQuerySetは並び替え・集計できないため、その範囲のpkで絞り込み直す
+    if qs.query.is_sliced:
+        qs = qs.model._default_manager.filter(pk__in=qs.values("pk"))
+
+    return (
+        qs.order_by()
+        .values(*fields)
+        .annotate(**{count_name: Count("pk")})
+        .filter(**{f"{count_name}__gt": 1})
+        .order_by(*fields)
+    )
+
+
+def qs_reverse_counts(instance, relations: Iterable[ForeignObjectRel]) -> Dict[str, int]:
+    """instanceを参照しているレコードの件数を、逆参照ごとに1回のクエリで返す({逆参照の名前: 件数})"""
+    annotations = {}
+    for relation in relations:
+        # 外部キー(多対多)を持つモデル側で集計したサブクエリ
+        remote_name = relation.field.name
+        counts = (
+            relation.related_model._default_manager.filter(**{remote_name: OuterRef("pk")})
+            .order_by()
+            .values(remote_name)
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        # 逆参照と同じ名前ではannotateできないため、別名にしておく
+        annotations[f"{relation.name}__count"] = Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+    if not annotations:
+        return {}
+
+    row = instance.__class__._default_manager.filter(pk=instance.pk).annotate(**annotations).values(*annotations).get()
+    return {alias[: -len("__count")]: count for alias, count in row.items()}
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from functools import lru_cache
 
 import factory
 
@@ -56,5 +57,7 @@ def random_str():
     return factory.Faker("paragraph")
 
 
+@lru_cache(maxsize=None)
 def dummy_image() -> bytes:
+    """1024x768のダミー画像(生成に時間がかかるため、1度だけ作成する)"""
     return factory.django.ImageField()._make_data({"width": 1024, "height": 768})
@@ -0,0 +1,48 @@
+import json
+from typing import Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from more_itertools import chunked
+
+# orjsonがインストールされていればそちらを使う
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover
+    orjson = None
+
+JSON_CONTENT_TYPE = "application/json"
+
+# ストリーミング時に1回で書き出す行数
+STREAM_CHUNK_SIZE = 100
+
+_encoder = DjangoJSONEncoder()
+
+
+def dumps(obj) -> bytes:
+    """JSONのバイト列に変換する(Decimal, Promiseなどorjsonが未対応の型はDjangoJSONEncoderに任せる)
+
+    日時もDjangoJSONEncoderに任せ、orjsonの有無によらず同じ形式(ミリ秒まで、UTCは "Z")にする。
+    """
+    if orjson:
+        return orjson.dumps(obj, default=_encoder.default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+
+    return json.dumps(obj, cls=DjangoJSONEncoder, ensure_ascii=False).encode()  # pragma: no cover
+
+
+def stream_json_list(rows: Iterable) -> Iterator[bytes]:
+    """JSONの配列を少しずつ書き出す"""
+    yield b"["
+    for i, chunk in enumerate(chunked(rows, STREAM_CHUNK_SIZE)):
+        if i:
+            yield b","
+        yield b",".join(dumps(row) for row in chunk)
+    yield b"]"
+
+
+def wants_json(request) -> bool:
+    """JSONを要求されているかどうか(?format=json、またはAcceptヘッダーがHTMLを含まずJSONを含む場合)"""
+    if request.GET.get("format") == "json":
+        return True
+
+    accept = request.headers.get("Accept", "")
+    return JSON_CONTENT_TYPE in accept and "text/html" not in accept
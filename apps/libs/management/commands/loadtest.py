@@ -0,0 +1,80 @@
+import importlib
+import inspect
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.utils.module_loading import import_string
+
+from apps.libs.tests.load import (
+    ClientTransport,
+    HttpTransport,
+    collect_load_requests,
+    create_load_session,
+    format_results,
+    live_server,
+    run_load,
+)
+
+
+def find_test_classes(path: str) -> list:
+    """モジュールならその中で定義されたテストクラスを、クラスならそれ自体を返す"""
+    try:
+        module = importlib.import_module(path)
+    except ModuleNotFoundError:
+        try:
+            return [import_string(path)]
+        except ImportError:
+            raise CommandError(f"`{path}` が見つかりません。")
+
+    return [
+        cls
+        for name, cls in inspect.getmembers(module, inspect.isclass)
+        if name.startswith("Test") and cls.__module__ == module.__name__ and hasattr(cls, "get_load_requests")
+    ]
+
+
+class Command(BaseCommand):
+    help = "GenericTest* のテストクラスの定義(URL、フィクスチャー、入力値)を使って負荷テストを行います。"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "targets", nargs="+", help="テストモジュールまたはテストクラス(例: apps.foo.tests.test_views)"
+        )
+        parser.add_argument("--concurrency", type=int, default=4, help="並行して送るスレッド数")
+        parser.add_argument("--iterations", type=int, default=10, help="スレッドごとにリクエストを送る回数")
+        parser.add_argument(
+            "--live-server",
+            action="store_true",
+            help="プロセス内で直接呼び出す代わりに、サーバーを起動してHTTPでリクエストを送る",
+        )
+        parser.add_argument("--keepdb", action="store_true", help="テスト用のDBを削除せずに残す")
+
+    def handle(self, *args, **options):
+        test_classes = [cls for path in options["targets"] for cls in find_test_classes(path)]
+        if not test_classes:
+            raise CommandError("負荷テストの対象となるテストクラスがありません。")
+
+        # テストと同じく、テスト用のDBにフィクスチャーを作成する
+        setup_test_environment(debug=False)
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options["keepdb"])
+        try:
+            requests = collect_load_requests(test_classes)
+            session_key = create_load_session()
+
+            if options["live_server"]:
+                with live_server() as base_url:
+                    results = self._run(requests, lambda: HttpTransport(base_url, session_key), options)
+            else:
+                results = self._run(requests, lambda: ClientTransport(session_key), options)
+        finally:
+            teardown_databases(old_config, verbosity=0, keepdb=options["keepdb"])
+            teardown_test_environment()
+
+        for line in format_results(results):
+            self.stdout.write(line)
+
+    @staticmethod
+    def _run(requests, transport_factory, options) -> list:
+        return [
+            run_load(request, transport_factory, options["concurrency"], options["iterations"]) for request in requests
+        ]
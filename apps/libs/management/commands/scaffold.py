@@ -1,97 +1,256 @@
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional
 
 from django.core.management.base import BaseCommand, CommandError
-from django.template.loader import render_to_string
+from django.template.loader import get_template
+
+from apps.libs.path import write_file_atomic
+
+# YAMLのスキーマはPyYAMLがインストールされている場合のみ
+try:
+    import yaml
+except ModuleNotFoundError:  # pragma: no cover
+    yaml = None
+
+# --perf で作成するインデックスの対象となる型(ForeignKeyはDjangoが自動でインデックスを作成する)
+INDEXED_FIELD_TYPES = ("date", "datetime")
+
+# (作成するファイル, テンプレート名)。テンプレート名がNoneの場合は空のファイル
+SCAFFOLD_FILES = (
+    ("__init__.py", None),
+    ("models.py", "scaffold/models.py.html"),
+    ("urls.py", "scaffold/urls.py.html"),
+    ("views.py", "scaffold/views.py.html"),
+    ("forms.py", "scaffold/forms.py.html"),
+    ("tests/__init__.py", None),
+    ("tests/factories.py", "scaffold/factories.py.html"),
+    ("tests/tests.py", "scaffold/tests.py.html"),
+    ("tests/test_models.py", "scaffold/test_models.html"),
+)
+PERF_SCAFFOLD_FILES = (("tests/test_perf.py", "scaffold/test_perf.py.html"),)
+
+
+def build_context(package: str, model: str, fields: list[str], perf: bool = False) -> dict:
+    """テンプレートに渡すコンテキストを作る"""
+    field_codes: list[str] = []
+    field_classes: set[str] = set()
+    choice_classes: list[str] = []
+    index_fields: list[str] = []
+    fk_fields: list[str] = []
+
+    # キャッシュ(ETag、行の断片キャッシュ)のバージョンとして使う
+    if perf and "updated_at" not in fields:
+        fields = fields + ["updated_at"]
+
+    for field in fields:
+        if field == "created_at":
+            field_code = 'created_at = DateTimeField(verbose_name="作成日時", auto_now_add=True)'
+            field_codes.append(field_code)
+            field_classes.add("DateTimeField")
+            index_fields.append(field)
+        elif field == "updated_at":
+            field_code = 'updated_at = DateTimeField(verbose_name="更新日時", auto_now=True)'
+            field_codes.append(field_code)
+            field_classes.add("DateTimeField")
+            index_fields.append(field)
+        elif field == "url":
+            field_code = 'url = URLField(verbose_name="URL", blank=True)'
+            field_codes.append(field_code)
+            field_classes.add("URLField")
+        else:
+            field_name, field_type, *field_args = field.split(":")
+            if field_type == "str":
+                field_code = f'{field_name} = CharField(max_length=100, verbose_name="")'
+                field_class = "CharField"
+            elif field_type == "date":
+                field_code = f'{field_name} = DateField(verbose_name="")'
+                field_class = "DateField"
+            elif field_type == "datetime":
+                field_code = f'{field_name} = DateTimeField(verbose_name="")'
+                field_class = "DateTimeField"
+            elif field_type == "text":
+                field_code = f'{field_name} = TextField(verbose_name="")'
+                field_class = "TextField"
+            elif field_type == "bool":
+                field_code = f'{field_name} = BooleanField(verbose_name="")'
+                field_class = "BooleanField"
+            elif field_type == "int":
+                field_code = f'{field_name} = IntegerField(verbose_name="")'
+                field_class = "IntegerField"
+            elif field_type == "decimal":
+                field_code = f'{field_name} = DecimalField(max_digits=12, decimal_places=2, verbose_name="")'
+                field_class = "DecimalField"
+            elif field_type == "choice":
+                choice_class = model + "".join(word.capitalize() for word in field_name.split("_"))
+                choice_classes.append(choice_class)
+                field_code = f'{field_name} = IntegerField(choices={choice_class}.choices, verbose_name="")'
+                field_class = "IntegerField"
+            elif field_type == "fk":
+                if len(field_args) != 1:
+                    raise CommandError("参照先のモデルを指定してください。(例: parent:fk:Parent)")  # pragma: no cover
+
+                field_code = f'{field_name} = ForeignKey("{field_args[0]}", on_delete=PROTECT, verbose_name="")'
+                field_class = "ForeignKey"
+                field_classes.add("PROTECT")
+                fk_fields.append(field_name)
+            else:
+                raise CommandError("不明なフィールドの型です。:" + field_type)  # pragma: no cover
+
+            field_codes.append(field_code)
+            field_classes.add(field_class)
+            if field_type in INDEXED_FIELD_TYPES:
+                index_fields.append(field_name)
+
+    const_package = ".".join(package.split(".")[0:2])
+    snake_name = package.split(".")[-1]
+    app_name = snake_name.replace("_", "-")
+    url_prefix = package.removeprefix("apps.").replace(".", ":").replace("_", "-")
+
+    context = dict(
+        package=package,
+        const_package=const_package,
+        app_name=app_name,
+        model_name=model,
+        url_prefix=url_prefix,
+        has_list=True,
+        has_detail=True,
+        has_add=True,
+        has_edit=True,
+        has_delete=True,
+        field_codes=field_codes,
+        # isortと同じく、定数(PROTECTなど)を先に並べる
+        field_classes=", ".join(sorted(field_classes, key=lambda name: (not name.isupper(), name))),
+        choice_classes=choice_classes,
+        perf=perf,
+        index_fields=index_fields if perf else [],
+        fk_fields=fk_fields if perf else [],
+    )
+
+    return context
+
+
+def get_scaffold_files(context: dict) -> tuple:
+    return SCAFFOLD_FILES + PERF_SCAFFOLD_FILES if context["perf"] else SCAFFOLD_FILES
+
+
+@lru_cache(maxsize=None)
+def get_scaffold_template(template_name: str):
+    """コンパイル済みのテンプレート(アプリケーションごとに読み込み直さない)"""
+    return get_template(template_name)
+
+
+def render_scaffold_file(template_name: Optional[str], context: dict) -> str:
+    return get_scaffold_template(template_name).render(context) if template_name else ""
+
+
+def render_files(context: dict) -> dict[str, str]:
+    return {name: render_scaffold_file(template_name, context) for name, template_name in get_scaffold_files(context)}
+
+
+def render_and_write(path: str, template_name: Optional[str], context: dict) -> bool:
+    return write_file_atomic(path, render_scaffold_file(template_name, context))
+
+
+def load_schema(schema_path: str) -> list[dict]:
+    """スキーマファイル(JSON、またはPyYAMLがあればYAML)を読み込む
+
+    `{"apps": [{"package": "apps.foo", "model": "Foo", "fields": ["name:str"], "perf": true}, ...]}`
+    あるいはそのリストの形式。
+    """
+    with open(schema_path, encoding="utf-8") as f:
+        if schema_path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise CommandError(
+                    "YAMLのスキーマを読み込むには、PyYAMLをインストールしてください。"
+                )  # pragma: no cover
+
+            schema = yaml.safe_load(f)
+        else:
+            schema = json.load(f)
+
+    apps = schema["apps"] if isinstance(schema, dict) else schema
+    for app in apps:
+        missing = [key for key in ("package", "model", "fields") if not app.get(key)]
+        if missing:
+            raise CommandError(f"スキーマに {', '.join(missing)} がありません。: {app}")
+
+    return apps
 
 
 class Command(BaseCommand):
     help = "アプリケーションの雛形を作成します。"
 
     def add_arguments(self, parser):
-        parser.add_argument("package", help="パッケージ")
-        parser.add_argument("model", help="モデルクラス名を指定")
-        parser.add_argument("fields", nargs="+", help="フィールド名を指定(例: name:str)")
+        parser.add_argument("package", nargs="?", help="パッケージ")
+        parser.add_argument("model", nargs="?", help="モデルクラス名を指定")
+        parser.add_argument(
+            "fields",
+            nargs="*",
+            help="フィールド名を指定(例: name:str, price:int, amount:decimal, status:choice, parent:fk:Parent)",
+        )
+        parser.add_argument(
+            "--perf",
+            action="store_true",
+            help="インデックス、select_related、キャッシュ用のupdated_at、クエリ数のテストも作成する",
+        )
+        parser.add_argument("--schema", help="複数のアプリケーションを定義したスキーマファイル(JSON/YAML)")
+        parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="--schemaで並行して作成するファイル数")
 
     def handle(self, *args, **options):
+        if options["schema"]:
+            return self.handle_schema(options["schema"], options["jobs"])
+
         package: str = options["package"]
         model: str = options["model"]
         fields: list[str] = options["fields"]
-        field_codes: list[str] = []
-
-        for field in fields:
-            if field == "created_at":
-                field_code = 'created_at = DateTimeField(verbose_name="作成日時", auto_now_add=True)'
-                field_codes.append(field_code)
-            elif field == "updated_at":
-                field_code = 'updated_at = DateTimeField(verbose_name="更新日時", auto_now=True)'
-                field_codes.append(field_code)
-            elif field == "url":
-                field_code = 'url = URLField(verbose_name="URL", blank=True)'
-                field_codes.append(field_code)
-            else:
-                field_name, field_type = field.split(":")
-                if field_type == "str":
-                    field_code = f'{field_name} = CharField(max_length=100, verbose_name="")'
-                    field_codes.append(field_code)
-                elif field_type == "date":
-                    field_code = f'{field_name} = DateField(verbose_name="")'
-                    field_codes.append(field_code)
-                elif field_type == "datetime":
-                    field_code = f'{field_name} = DateTimeField(verbose_name="")'
-                    field_codes.append(field_code)
-                elif field_type == "text":
-                    field_code = f'{field_name} = TextField(verbose_name="")'
-                    field_codes.append(field_code)
-                elif field_type == "bool":
-                    field_code = f'{field_name} = BooleanField(verbose_name="")'
-                    field_codes.append(field_code)
-                else:
-                    raise CommandError("不明なフィールドの型です。:" + field_type)  # pragma: no cover
-
-        const_package = ".".join(package.split(".")[0:2])
-        snake_name = package.split(".")[-1]
-        app_name = snake_name.replace("_", "-")
-        url_prefix = package.removeprefix("apps.").replace(".", ":").replace("_", "-")
+        if not (package and model and fields):
+            raise CommandError("パッケージ、モデルクラス名、フィールド名を指定してください。")  # pragma: no cover
+
         directory = package.replace(".", "/")
         test_directory = directory + "/tests"
-
-        context = dict(
-            package=package,
-            const_package=const_package,
-            app_name=app_name,
-            model_name=model,
-            url_prefix=url_prefix,
-            has_list=True,
-            has_detail=True,
-            has_add=True,
-            has_edit=True,
-            has_delete=True,
-            field_codes=field_codes,
-        )
-
-        init_py = ""
-        models_py = render_to_string("scaffold/models.py.html", context)
-        urls_py = render_to_string("scaffold/urls.py.html", context)
-        views_py = render_to_string("scaffold/views.py.html", context)
-        forms_py = render_to_string("scaffold/forms.py.html", context)
-        tests_init_py = ""
-        factories_py = render_to_string("scaffold/factories.py.html", context)
-        tests_py = render_to_string("scaffold/tests.py.html", context)
-        tests_model_py = render_to_string("scaffold/test_models.html", context)
+        files = render_files(build_context(package, model, fields, options["perf"]))
         self.exec(
             directory,
             test_directory,
-            init_py,
-            models_py,
-            urls_py,
-            views_py,
-            forms_py,
-            tests_init_py,
-            factories_py,
-            tests_py,
-            tests_model_py,
+            files["__init__.py"],
+            files["models.py"],
+            files["urls.py"],
+            files["views.py"],
+            files["forms.py"],
+            files["tests/__init__.py"],
+            files["tests/factories.py"],
+            files["tests/tests.py"],
+            files["tests/test_models.py"],
+            test_perf_py=files.get("tests/test_perf.py"),
         )
 
+    def handle_schema(self, schema_path: str, jobs: int):
+        """スキーマファイルに書かれたすべてのアプリケーションの雛形を、1つのプロセスでまとめて作成する"""
+        files = {}
+        for app in load_schema(schema_path):
+            directory = app["package"].replace(".", "/")
+            context = build_context(app["package"], app["model"], app["fields"], app.get("perf", False))
+            for name, template_name in get_scaffold_files(context):
+                files[f"{directory}/{name}"] = (template_name, context)
+
+        for directory in {os.path.dirname(path) for path in files}:
+            os.makedirs(directory, exist_ok=True)
+
+        # 描画と書き込みはファイルごとに並行して行う
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = {
+                path: executor.submit(render_and_write, path, template_name, context)
+                for path, (template_name, context) in files.items()
+            }
+            written = [path for path, future in futures.items() if future.result()]
+
+        for path in written:
+            self.stdout.write(f"作成: {path}")
+        self.stdout.write(f"{len(written)}個のファイルを作成しました。(変更なし: {len(files) - len(written)}個)")
+
     @staticmethod
     def exec(
         directory,
@@ -105,6 +264,7 @@ class Command(BaseCommand):
         factories_py,
         tests_py,
         tests_model_py,
+        test_perf_py=None,
     ):  # pragma: no cover
 
         os.makedirs(directory, exist_ok=True)
@@ -136,3 +296,7 @@ class Command(BaseCommand):
 
         with open(test_directory + "/test_models.py", "w") as f:
             f.write(tests_model_py)
+
+        if test_perf_py is not None:
+            with open(test_directory + "/test_perf.py", "w") as f:
+                f.write(test_perf_py)
@@ -1,5 +1,7 @@
+import hashlib
 import os
 import secrets
+import stat
 from typing import Callable
 
 CHARS = "0123456789abcdef"
@@ -14,3 +16,34 @@ def random_filepath(base_dir: str, filename_length: int = 64) -> Callable[[str],
         return f"{base_dir}/{filename}{ext.lower()}"
 
     return f
+
+
+def write_file_atomic(path: str, content: str) -> bool:
+    """内容が変わった場合のみ、一時ファイルに書き込んでから置き換える(書き込んだ場合はTrue)
+
+    書き込み中に中断しても、中途半端な内容のファイルが残らない。
+    パーミッションは、既存のファイルがあればそれを引き継ぎ、なければ通常の書き込みと同じ(umaskを適用)になる。
+    """
+    data = content.encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            if hashlib.sha256(f.read()).digest() == hashlib.sha256(data).digest():
+                return False
+            mode = stat.S_IMODE(os.fstat(f.fileno()).st_mode)
+    except FileNotFoundError:
+        mode = None
+
+    # mkstempは0600で作成するため使わない(os.openであればumaskが適用される)
+    temp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.{secrets.token_hex(8)}.tmp")
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        if mode is not None:
+            os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    return True
@@ -6,6 +6,8 @@ from django.db import models
 from django.db.models import BooleanField, CharField, ForeignKey, IntegerField
 from django.views.generic.base import ContextMixin
 
+from apps.libs.db.introspection import get_model_descriptor
+
 
 @dataclass
 class Perspective:
@@ -116,7 +118,7 @@ class ListViewPerspectiveMixin(ContextMixin):
     def get_list_perspectives(cls):
         perspectives = []
 
-        fields = cls._meta.fields
+        fields = get_model_descriptor(cls).fields
         for field in fields:
             if isinstance(field, ForeignKey) and not field.remote_field.parent_link:
                 # 外部キーかつ親へのリンクを除く
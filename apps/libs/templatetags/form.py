@@ -1,7 +1,7 @@
 from django import template
-from django.db.models import FileField
-from django.db.models.query_utils import DeferredAttribute
-from django.forms import Field, Form, ModelForm
+from django.forms import Form, ModelForm
+
+from apps.libs.db.introspection import get_model_descriptor
 
 register = template.Library()
 
@@ -11,13 +11,5 @@ def has_multipart(form: Form) -> bool:
     if not isinstance(form, ModelForm):
         return False
 
-    model = form._meta.model
-    fields: dict = form.fields
-
-    for name, _field in fields.items():  # type: str, Field
-        if hasattr(model, name):
-            model_field = getattr(model, name)  # type: DeferredAttribute
-            if isinstance(model_field.field, FileField):
-                return True
-
-    return False
+    file_fields = get_model_descriptor(form._meta.model).file_fields
+    return any(name in file_fields for name in form.fields)
@@ -1,23 +1,43 @@
+import hashlib
+import time
+from functools import lru_cache
 from importlib import import_module
+from typing import List, Type
 
 from django import template
 from django.apps import AppConfig
 from django.conf import settings
-from django.urls import reverse
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.template.loader import render_to_string
+from django.urls import get_script_prefix, get_urlconf, reverse
+from django.utils.translation import get_language
 from more_itertools import chunked
 
 register = template.Library()
 
+# 描画済みのHTMLをキャッシュする秒数(settings.GLOBAL_MENU_CACHE_TIMEOUT で変更できる)
+DEFAULT_CACHE_TIMEOUT = 300
 
-@register.inclusion_tag("global_menu.html")
-def global_menu():
+# メニューのキャッシュのバージョン(clear_global_menu_cache() で更新し、他のプロセスのキャッシュも無効にする)
+VERSION_CACHE_KEY = "global_menu:version"
 
-    links = []
+
+@lru_cache(maxsize=None)
+def get_global_menu_app_configs() -> List[Type[AppConfig]]:
+    """settings.GLOBAL_MENU_APPS のAppConfigを取得する(1度だけ)"""
+    app_configs = []
     for app_name in settings.GLOBAL_MENU_APPS:
-        # AppConfigを取得
         module, class_name = app_name.rsplit(".", 1)
-        app_config = getattr(import_module(module), class_name)  # type: AppConfig
+        app_configs.append(getattr(import_module(module), class_name))
+
+    return app_configs
+
 
+def get_global_menu():
+    links = []
+    for app_config in get_global_menu_app_configs():
         config_name = app_config.name  # type: str
         app_name = config_name[5:]
         verbose_name = app_config.verbose_name
@@ -42,7 +62,42 @@ def global_menu():
     ]
 
     # gridのために2つずつにしてから渡す
-    chunked_global_menu = chunked(menus, 2)
-    return {
-        "global_menu": chunked_global_menu,
-    }
+    return list(chunked(menus, 2))
+
+
+def get_global_menu_variant() -> str:
+    """描画結果を変えるもの(言語、URLconf、スクリプトのプレフィックス)
+
+    メニューはユーザーによらないため、ユーザーや権限はキーに含めない。
+    """
+    source = repr((get_language(), get_urlconf(), get_script_prefix()))
+    return hashlib.md5(source.encode()).hexdigest()
+
+
+def _get_cache_version():
+    # バージョンがキャッシュから消えた場合も、新しいバージョンになるだけで古いHTMLは使われない
+    return cache.get_or_set(VERSION_CACHE_KEY, time.time_ns, timeout=None)
+
+
+@register.simple_tag
+def global_menu():
+    key = f"global_menu:{_get_cache_version()}:{get_global_menu_variant()}"
+    rendered = cache.get(key)
+    if rendered is None:
+        rendered = render_to_string("global_menu.html", {"global_menu": get_global_menu()})
+        cache.set(key, rendered, getattr(settings, "GLOBAL_MENU_CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT))
+
+    return rendered
+
+
+def clear_global_menu_cache():
+    """メニューのキャッシュを破棄する(メニューの設定やURLを変更したときに呼ぶ)"""
+    get_global_menu_app_configs.cache_clear()
+    cache.set(VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+
+
+@receiver(setting_changed)
+def _on_setting_changed(*, setting, **kwargs):
+    # URLconfやメニューの設定が変わったときはキャッシュを破棄
+    if setting in ("ROOT_URLCONF", "GLOBAL_MENU_APPS", "GLOBAL_MENU_CACHE_TIMEOUT"):
+        clear_global_menu_cache()
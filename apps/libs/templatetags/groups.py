@@ -4,11 +4,13 @@ from typing import Optional, Type
 
 from django import template
 from django.db import models
-from django.db.models import Field, Model, QuerySet
+from django.db.models import Model, QuerySet
 from django.template import RequestContext
 from django.template.base import FilterExpression
 from django.template.exceptions import TemplateSyntaxError
 
+from apps.libs.db.introspection import get_model_descriptor
+
 register = template.Library()
 
 
@@ -62,19 +64,13 @@ class GroupingNode(template.Node):
             instance = values[0]
             return getattr(instance, attr_name)
 
-        field: Field = getattr(model_class, attr_name).field
-
         # choicesが存在しないまたは未指定のときはキー自体を返す
-        if not hasattr(field, "choices") or not field.choices:
+        choices = get_model_descriptor(model_class).choices.get(attr_name)
+        if not choices:
             return choice_key
 
         # choicesのどれにもマッチしない場合はキー自体を返す(通常はない)
-        choice_list = list(filter(lambda c: c[0] == choice_key, field.choices))
-        if not choice_list:
-            return choice_key
-
-        _, label = choice_list[0]
-        return label
+        return choices.get(choice_key, choice_key)
 
     def make_group_result(self, key, val, model_class: Type[Model], group_by_name):
         values = list(val)
@@ -1,18 +1,29 @@
 from datetime import date, datetime
 
 from django import template
-from django.db.models import Model
+from django.db.models import ForeignKey, Model, prefetch_related_objects
 from django.db.models.fields.files import ImageFieldFile
 from django.template.defaultfilters import safe
 from django.utils.formats import localize
-from django.utils.html import urlize
+from django.utils.html import conditional_escape, urlize
 from django.utils.safestring import mark_safe
 from django.utils.timezone import localtime
 
+from apps.libs.datetime import label_weekdays
+
 register = template.Library()
 
 
+def _may_contain_url(s: str) -> bool:
+    """URLまたはメールアドレスを含む可能性があるかどうか(urlizeはいずれも「.」「@」「:」のどれかを必要とする)"""
+    return "." in s or "@" in s or ":" in s
+
+
 def urlize_with_target_blank(s):
+    # URLを含みえない場合は正規表現での解析を省略してエスケープのみ行う
+    if isinstance(s, str) and not _may_contain_url(s):
+        return mark_safe(conditional_escape(s))
+
     return mark_safe(urlize(s, nofollow=True, autoescape=True).replace("<a ", '<a target="_blank" '))
 
 
@@ -45,3 +56,42 @@ def natural_text(obj):
         return "(なし)"
 
     return urlize_with_target_blank(obj)
+
+
+@register.filter
+def natural_text_column(object_list, key: str):
+    """object_listの各オブジェクトのkey属性を、まとめて natural_text で変換したリストを返す
+
+    keyが外部キーの場合は参照先をまとめて取得し、同じ参照先の変換結果は使い回す。
+    """
+    object_list = list(object_list)
+
+    # 外部キーの場合は参照先を1クエリでまとめて取得
+    if object_list and isinstance(object_list[0], Model):
+        field = getattr(object_list[0].__class__, key, None)
+        if isinstance(getattr(field, "field", None), ForeignKey):
+            prefetch_related_objects(object_list, key)
+
+    results = []
+    rendered_models = {}
+    for obj in object_list:
+        value = getattr(obj, key)
+        if isinstance(value, Model):
+            model_key = (value.__class__, value.pk)
+            if model_key not in rendered_models:
+                rendered_models[model_key] = natural_text(value)
+            results.append(rendered_models[model_key])
+        else:
+            results.append(natural_text(value))
+
+    return results
+
+
+@register.filter
+def with_weekday(dates, width: str = "narrow"):
+    """日付のリストを (日付, 曜日の名前) のリストにする
+
+    例: `{% for day, weekday in date_list|with_weekday %}{{ day|date:"j" }}({{ weekday }}){% endfor %}`
+    """
+    dates = list(dates)
+    return list(zip(dates, label_weekdays(dates, width)))
@@ -1,19 +1,18 @@
 from django import template
 from django.db.models import Field, ForeignKey, Model
 
+from apps.libs.db.introspection import get_model_descriptor
+
 register = template.Library()
 
 
 @register.filter
 def list_fields(obj: Model):
-    fields = obj._meta.fields
+    # 親クラスへのポインタは除く
+    fields = get_model_descriptor(obj.__class__).display_fields
 
     values = []
     for field in fields:  # type: Field
-        if field.name.endswith("_ptr"):
-            # 親クラスへのポインタの場合は無視
-            continue
-
         if isinstance(field, ForeignKey):
             value = dict(name=field.verbose_name, value=getattr(obj, field.name))
         elif hasattr(obj, f"get_{field.name}_display"):
@@ -0,0 +1,42 @@
+from django import template
+from django.template.base import FilterExpression, NodeList
+from django.template.exceptions import TemplateSyntaxError
+from django.utils.safestring import mark_safe
+
+from apps.libs.row_cache import RowFragmentCache
+
+register = template.Library()
+
+
+@register.tag
+def row_cache(parser, token):
+    """一覧の1行分をキャッシュするタグ(Viewのコンテキストに `row_cache` がない場合はそのまま描画する)
+
+    {% row_cache object %}...{% endrow_cache %}
+    """
+    bits = token.split_contents()
+    if len(bits) != 2:
+        raise TemplateSyntaxError("'row_cache' は1つの引数を持つ必要があります。")  # pragma: no cover
+
+    nodelist = parser.parse(("endrow_cache",))
+    parser.delete_first_token()
+    return RowCacheNode(nodelist, parser.compile_filter(bits[1]))
+
+
+class RowCacheNode(template.Node):
+    def __init__(self, nodelist: NodeList, instance: FilterExpression):
+        self.nodelist = nodelist
+        self.instance = instance
+
+    def render(self, context):
+        cache = context.get("row_cache")  # type: RowFragmentCache
+        if cache is None:
+            return self.nodelist.render(context)
+
+        instance = self.instance.resolve(context)
+        fragment = cache.get(instance)
+        if fragment is None:
+            fragment = self.nodelist.render(context)
+            cache.set(instance, fragment)
+
+        return mark_safe(fragment)
@@ -2,11 +2,17 @@ from types import MethodType
 
 from django import template
 
+from apps.libs.db.shortcuts import qs_is_aggregatable, qs_total
+
 register = template.Library()
 
 
 @register.filter
 def total(object_list: list, key: str):
+    # 未評価のQuerySetでモデルのフィールドの場合は、インスタンスを作らずにDBで集計する
+    if qs_is_aggregatable(object_list, key):
+        return qs_total(object_list, key)
+
     total_ = 0
 
     for obj in object_list:
@@ -1,7 +1,9 @@
-from urllib.parse import parse_qs, quote, urlparse
+from urllib.parse import quote
 
 from django import template
 
+from apps.libs.url import parse_next_chain
+
 register = template.Library()
 
 
@@ -16,17 +18,12 @@ def concat_next_url(url: str, next_url: str):
 
 @register.filter
 def inherit_next_url(url: str, current_url: str):
-    parsed = urlparse(current_url)
-    query = parse_qs(parsed.query)
+    chain = parse_next_chain(current_url)
 
-    if not query.get("next"):
+    if not chain:
         return url
 
-    next_param = query.get("next")[0]
-    parsed_next_param = urlparse(next_param)
-    query_next_param = parse_qs(parsed_next_param.query)
-    if query_next_param.get("next"):
-        next_next_param = query_next_param.get("next")[0]
-        return f"{url}?next={next_next_param}"
+    if len(chain) > 1:
+        return f"{url}?next={chain[1]}"
     else:
-        return f"{url}?next={next_param}"
+        return f"{url}?next={chain[0]}"
@@ -3,12 +3,27 @@ from dataclasses import dataclass
 import pytest
 
 
-@pytest.mark.django_db(transaction=True)
+# GenericTest* は、テストごとにロールバックして後始末する(テーブルをTRUNCATEするより速い)
+# pytest-xdistで並列実行した場合は、pytest-djangoがワーカーごとにテスト用のDBを作成する
+@pytest.mark.django_db
 class GenericTest:
     pass
 
 
 @pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("transactional_db")
+class GenericTransactionTest:
+    """コミットが必要なテスト(on_commit、別スレッドからの参照など)のための基底クラス
+
+    GenericTest* と組み合わせる場合は、`class TestFoo(GenericTransactionTest, GenericTestEdit)` のように継承する。
+    クラスのマーカーは基底クラスのものが優先されるため、サブクラスに `@pytest.mark.django_db(transaction=True)`
+    を付けてもトランザクションモードにはならない(transactional_dbフィクスチャーで切り替える)。
+    """
+
+    pass
+
+
+@pytest.mark.django_db
 class GenericTestTemplate:
     pass
 
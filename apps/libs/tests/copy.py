@@ -21,7 +21,7 @@ from apps.libs.tests.utils import (
 )
 
 
-@pytest.mark.django_db(transaction=True)
+@pytest.mark.django_db
 class GenericTestCopy(CreateInstanceTestMixin):
     src_model_factory = None
     model: Type[Model] = None
@@ -181,6 +181,7 @@ class GenericTestCopy(CreateInstanceTestMixin):
         assert res.status_code == 404
 
 
+# MoveMixinのatomicなform_validを、実際のコミット・ロールバックで検証するため、トランザクションモードのまま
 @pytest.mark.django_db(transaction=True)
 class GenericTestMove:
     src_model_factory = None
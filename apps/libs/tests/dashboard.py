@@ -1,6 +1,6 @@
 import pytest
 
 
-@pytest.mark.django_db(transaction=True)
+@pytest.mark.django_db
 class GenericTestDashboard:
     pass
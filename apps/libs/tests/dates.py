@@ -1,4 +1,4 @@
-from typing import Type
+from typing import List, Type
 from unittest import mock
 
 import pytest
@@ -7,10 +7,12 @@ from django.db.models.fields.related_descriptors import ForwardManyToOneDescript
 
 from apps.libs.collections import as_list
 from apps.libs.datetime import local_today
+from apps.libs.tests.html import select
+from apps.libs.tests.load import LoadRequest
 from apps.libs.tests.utils import ObjectItemList, get_heading, get_title
 
 
-@pytest.mark.django_db(transaction=True)
+@pytest.mark.django_db
 class GenericTestMonthArchive:
     model: Type[Model] = None
     url = None
@@ -35,6 +37,13 @@ class GenericTestMonthArchive:
     def get_title(self):
         raise NotImplementedError("get_title(self)を実装してください")  # pragma: no cover
 
+    def get_load_requests(self) -> List[LoadRequest]:
+        """負荷テスト(loadtestコマンド)で送るリクエスト"""
+        self.get_fixture()
+
+        urls = [self.url] + [self.url + f"?perspective={key}" for key in as_list(self.perspective_keys)]
+        return [LoadRequest(url) for url in urls]
+
     def test_list(self, auth0_app):
         instance_list = self.get_fixture()
 
@@ -45,13 +54,13 @@ class GenericTestMonthArchive:
         assert get_title(res) == self.get_title()
         assert get_heading(res) == self.get_title()
 
-        item_list = ObjectItemList(res.html.select("#object-list > li"))
+        item_list = ObjectItemList(select(res, "#object-list > li"))
 
         assert item_list.links() == self.get_anchor_urls(instance_list)
         assert item_list.anchor_texts() == self.get_anchor_texts(instance_list)
 
         # パースペクティブの検証
-        perspectives = [anchor["data-perspective"] for anchor in list(res.html.select(".perspectives a"))]
+        perspectives = [anchor["data-perspective"] for anchor in select(res, ".perspectives a")]
         assert perspectives == list(self.perspective_keys)
 
     @classmethod
@@ -72,7 +81,7 @@ class GenericTestMonthArchive:
         assert res.status_code == 200
 
 
-@pytest.mark.django_db(transaction=True)
+@pytest.mark.django_db
 class GenericTestLatestMonthRedirect:
     model = None
     model_factory = None
@@ -101,7 +110,7 @@ class GenericTestLatestMonthRedirect:
         assert res.location == self.get_latest_url(instance)
 
 
-@pytest.mark.django_db(transaction=True)
+@pytest.mark.django_db
 class GenericTestLatestYearRedirect:
     model = None
     model_factory = None
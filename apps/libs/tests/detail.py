@@ -1,4 +1,4 @@
-from typing import Type
+from typing import List, Type
 
 import pytest
 from django.db.models import Model
@@ -6,10 +6,12 @@ from django.db.models import Model
 from apps.libs.collections import as_list
 from apps.libs.str import fqcn
 from apps.libs.tests.base import NullEntity
+from apps.libs.tests.html import select
+from apps.libs.tests.load import LoadRequest
 from apps.libs.tests.mixins import SingleInstanceTestMixin
 
 
-@pytest.mark.django_db(transaction=True)
+@pytest.mark.django_db
 class GenericTestDetail(SingleInstanceTestMixin):
     model: Type[Model] = None
     model_factory = None
@@ -29,6 +31,16 @@ class GenericTestDetail(SingleInstanceTestMixin):
     def get_display_keys(self, instance):
         return self.display_keys
 
+    def get_load_requests(self) -> List[LoadRequest]:
+        """負荷テスト(loadtestコマンド)で送るリクエスト"""
+        instance = as_list(self.model_factory)[0]()
+        for related_model_factory, key in self.related_model_factories:
+            related_model_factory(**{key: instance})
+
+        url = self.get_url(instance)
+        urls = [url] + [url + f"?perspective={key}" for key in as_list(self.perspective_keys)]
+        return [LoadRequest(url) for url in urls]
+
     @classmethod
     def parametrize_test_title(cls):
         model_factories = as_list(cls.model_factory)
@@ -64,7 +76,7 @@ class GenericTestDetail(SingleInstanceTestMixin):
         assert res.status_code == 200
 
         # パースペクティブの検証
-        perspectives = [anchor["data-perspective"] for anchor in list(res.html.select(".perspectives a"))]
+        perspectives = [anchor["data-perspective"] for anchor in select(res, ".perspectives a")]
         assert perspectives == list(self.perspective_keys)
 
     @classmethod
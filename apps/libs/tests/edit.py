@@ -1,4 +1,4 @@
-from typing import Dict, Type, Union
+from typing import Dict, List, Type, Union
 
 import pytest
 from django.db.models import Model
@@ -7,6 +7,7 @@ from webtest import Form
 from apps.libs.collections import as_list
 from apps.libs.str import fqcn
 from apps.libs.tests.base import NullEntity
+from apps.libs.tests.load import LoadRequest
 from apps.libs.tests.mixins import CreateInstanceTestMixin, SingleInstanceTestMixin
 from apps.libs.tests.utils import (
     _normalize_value,
@@ -21,7 +22,7 @@ from apps.libs.tests.utils import (
 )
 
 
-@pytest.mark.django_db(transaction=True)
+@pytest.mark.django_db
 class GenericTestAdd(CreateInstanceTestMixin):
     model: Type[Model] = None
     url = None
@@ -46,6 +47,11 @@ class GenericTestAdd(CreateInstanceTestMixin):
         assert self.model, f"{fqcn(self)}に `model` が定義されていません。"
         return self.model._meta.verbose_name + "を追加"
 
+    def get_load_requests(self) -> List[LoadRequest]:
+        """負荷テスト(loadtestコマンド)で送るリクエスト(送信するたびにレコードが増える)"""
+        maximum_inputs = as_list(self.maximum_inputs)[0]
+        return [LoadRequest(self.get_url()), LoadRequest(self.get_url(), "POST", maximum_inputs)]
+
     @classmethod
     def parametrize_test_display(cls):
         maximum_inputs = as_list(cls.maximum_inputs)
@@ -138,7 +144,7 @@ class GenericTestAdd(CreateInstanceTestMixin):
         assert res.status_code == 200
 
 
-@pytest.mark.django_db(transaction=True)
+@pytest.mark.django_db
 class GenericTestEdit:
     model: Type[Model] = None
     model_factory = None
@@ -154,6 +160,12 @@ class GenericTestEdit:
         assert self.model, f"{fqcn(self)}に `model` が定義されていません。"
         return self.model._meta.verbose_name + "を編集"
 
+    def get_load_requests(self) -> List[LoadRequest]:
+        """負荷テスト(loadtestコマンド)で送るリクエスト"""
+        instance = as_list(self.model_factory)[0]()
+        maximum_inputs = as_list(self.maximum_inputs)[0]
+        return [LoadRequest(self.get_url(instance)), LoadRequest(self.get_url(instance), "POST", maximum_inputs)]
+
     @classmethod
     def parametrize_test_display(cls):
         model_factories = as_list(cls.model_factory)
@@ -260,7 +272,7 @@ class GenericTestEdit:
         assert res.status_code == 404
 
 
-@pytest.mark.django_db(transaction=True)
+@pytest.mark.django_db
 class GenericTestDelete(SingleInstanceTestMixin):
     model: Type[Model] = None
     model_factory = None
@@ -356,7 +368,7 @@ class GenericTestDelete(SingleInstanceTestMixin):
         assert instance
 
 
-@pytest.mark.django_db(transaction=True)
+@pytest.mark.django_db
 class GenericTestDeleteList:
     model: Type[Model] = None
     model_factory = None
@@ -403,7 +415,7 @@ class GenericTestDeleteList:
             assert self.model.objects.get(pk=not_delete_instance.pk)
 
 
-@pytest.mark.django_db(transaction=True)
+@pytest.mark.django_db
 class GenericTestStatusUpdateView:
     statuses = None
     model_factory = None
@@ -20,7 +20,7 @@ from apps.libs.tests.utils import (
 )
 
 
-@pytest.mark.django_db(transaction=True)
+@pytest.mark.django_db
 class GenericTestInlineFormset:
     parent_model: Type[Model] = None
     child_model: Type[Model] = None
@@ -0,0 +1,99 @@
+from functools import lru_cache
+from typing import List, Optional
+
+from bs4 import BeautifulSoup
+from bs4.builder import HTMLTreeBuilder
+from django.conf import settings
+from django_webtest import DjangoWebtestResponse
+
+# lxml(+cssselect)がインストールされていればそちらを使う
+try:
+    from cssselect import HTMLTranslator
+    from lxml import etree
+    from lxml import html as lxml_html
+except ModuleNotFoundError:  # pragma: no cover
+    lxml_html = None
+
+
+@lru_cache(maxsize=None)
+def _compile_selector(selector: str):
+    # BeautifulSoupのselect()と同じく、要素自身は含めずに子孫だけを対象にする
+    return etree.XPath(HTMLTranslator().css_to_xpath(selector, prefix="descendant::"))
+
+
+# BeautifulSoupがリストで返す属性(classなど)
+MULTI_VALUED_ATTRIBUTES = HTMLTreeBuilder.DEFAULT_CDATA_LIST_ATTRIBUTES
+
+
+def _is_multi_valued(tag: str, key: str) -> bool:
+    return key in MULTI_VALUED_ATTRIBUTES["*"] or key in MULTI_VALUED_ATTRIBUTES.get(tag, ())
+
+
+class LxmlElement:
+    """lxmlの要素を、BeautifulSoupのTagと同じように扱うためのラッパー
+
+    BeautifulSoupと同じく、classなどの複数の値を持つ属性はリストで返す。
+    """
+
+    __slots__ = ("element",)
+
+    def __init__(self, element):
+        self.element = element
+
+    def select(self, selector: str) -> List["LxmlElement"]:
+        return [LxmlElement(element) for element in _compile_selector(selector)(self.element)]
+
+    def select_one(self, selector: str) -> Optional["LxmlElement"]:
+        elements = _compile_selector(selector)(self.element)
+        return LxmlElement(elements[0]) if elements else None
+
+    def get(self, key: str, default=None):
+        value = self.element.get(key)
+        if value is None:
+            return default
+
+        return value.split() if _is_multi_valued(self.element.tag, key) else value
+
+    def __getitem__(self, key: str):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+
+        return value
+
+    def get_text(self) -> str:
+        return self.element.text_content()
+
+
+def get_html_parser() -> str:
+    """settings.TEST_HTML_PARSER ("bs4", "lxml", "auto") から使用するパーサーを決める
+
+    デフォルトはBeautifulSoup。lxmlを使う場合は "lxml"(または、インストールされていれば使う "auto")を指定する。
+    """
+    parser = getattr(settings, "TEST_HTML_PARSER", "bs4")
+    if parser == "auto":
+        return "lxml" if lxml_html else "bs4"
+
+    return parser
+
+
+def parse_html(res: DjangoWebtestResponse):
+    """レスポンスのHTMLを解析する(1つのレスポンスにつき1回だけ解析し、結果をレスポンスにキャッシュする)"""
+    document = getattr(res, "_parsed_html", None)
+    if document is None:
+        if get_html_parser() == "lxml":
+            document = LxmlElement(lxml_html.document_fromstring(res.testbody))
+        else:
+            document = BeautifulSoup(res.testbody, "html.parser")
+
+        res._parsed_html = document
+
+    return document
+
+
+def select(res: DjangoWebtestResponse, selector: str) -> list:
+    return parse_html(res).select(selector)
+
+
+def select_one(res: DjangoWebtestResponse, selector: str):
+    return parse_html(res).select_one(selector)
@@ -1,4 +1,4 @@
-from typing import Type
+from typing import List, Type
 from unittest import mock
 
 import pytest
@@ -8,10 +8,12 @@ from django.db.models.fields.related import ForwardManyToOneDescriptor
 from apps.libs.collections import as_list
 from apps.libs.str import fqcn
 from apps.libs.tests.base import NullEntity
-from apps.libs.tests.utils import ObjectItemList, get_heading, get_title
+from apps.libs.tests.html import select
+from apps.libs.tests.load import LoadRequest
+from apps.libs.tests.utils import ObjectItemList, assert_no_deferred_loads, get_heading, get_title
 
 
-@pytest.mark.django_db(transaction=True)
+@pytest.mark.django_db
 class GenericTestList:
     model: Type[Model] = None
     url = None
@@ -40,6 +42,13 @@ class GenericTestList:
     def get_anchor_texts(self, instance_list):
         return [self.get_anchor_text(instance) for instance in instance_list]
 
+    def get_load_requests(self) -> List[LoadRequest]:
+        """負荷テスト(loadtestコマンド)で送るリクエスト"""
+        self.get_fixture()
+
+        urls = [self.url] + [self.url + f"?perspective={key}" for key in as_list(self.perspective_keys)]
+        return [LoadRequest(url) for url in urls]
+
     def test_list(self, auth0_app):
         instance_list = self.get_fixture()
 
@@ -48,7 +57,8 @@ class GenericTestList:
             instance.refresh_from_db()
 
         with mock.patch.object(ForwardManyToOneDescriptor, "get_object", side_effect=Exception):
-            res = auth0_app.get(self.url)
+            with assert_no_deferred_loads():
+                res = auth0_app.get(self.url)
 
         # タイトルと見出しの検証
         assert get_title(res) == self.get_title()
@@ -58,7 +68,7 @@ class GenericTestList:
             selector = "#object-list > tr > td:first-child"
         else:
             selector = "#object-list > li"
-        item_list = ObjectItemList(res.html.select(selector))
+        item_list = ObjectItemList(select(res, selector))
 
         # TODO: POSTで送信するボタンが検知できていない
         for item, instance in zip(item_list, instance_list):
@@ -67,7 +77,7 @@ class GenericTestList:
         assert item_list.anchor_texts() == self.get_anchor_texts(instance_list)
 
         # パースペクティブの検証
-        perspectives = [anchor["data-perspective"] for anchor in list(res.html.select(".perspectives a"))]
+        perspectives = [anchor["data-perspective"] for anchor in select(res, ".perspectives a")]
         assert perspectives == list(self.perspective_keys)
 
     @classmethod
@@ -87,7 +97,7 @@ class GenericTestList:
         assert res.status_code == 200
 
 
-@pytest.mark.django_db(transaction=True)
+@pytest.mark.django_db
 class GenericTestChildList:
     model: Type[Model] = None
     url = None
@@ -115,6 +125,13 @@ class GenericTestChildList:
     def get_anchor_texts(self, instance_list):
         return [self.get_anchor_text(instance) for instance in instance_list]
 
+    def get_load_requests(self) -> List[LoadRequest]:
+        """負荷テスト(loadtestコマンド)で送るリクエスト"""
+        parent_instance = as_list(self.parent_model_factory)[0]()
+        self.get_fixture(parent_instance)
+
+        return [LoadRequest(self.get_url(parent_instance))]
+
     @classmethod
     def parametrize_test_list(cls):
         model_factories = as_list(cls.parent_model_factory)
@@ -137,7 +154,7 @@ class GenericTestChildList:
         assert get_heading(res) == self.get_title(parent_instance)
 
         selector = "#object-list > li"
-        item_list = ObjectItemList(res.html.select(selector))
+        item_list = ObjectItemList(select(res, selector))
 
         # TODO: POSTで送信するボタンが検知できていない
         for item, instance in zip(item_list, instance_list):
@@ -0,0 +1,273 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from http.cookies import SimpleCookie
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.error import HTTPError
+from urllib.request import HTTPRedirectHandler, Request, build_opener
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connections
+from django.db.models import Model
+from django.test import Client
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.test.testcases import LiveServerThread
+from django.test.utils import modify_settings
+from social_django.models import UserSocialAuth
+
+from apps.libs.factory import UploadFile
+from apps.libs.tests.utils import prepare_inputs
+
+
+@dataclass
+class LoadRequest:
+    """負荷テストで送るリクエスト(GenericTest*.get_load_requests() が返す)"""
+
+    url: str
+    method: str = "GET"
+    # POSTする値(maximum_inputs などと同じ形式)
+    data: Optional[Dict] = None
+    # 集計の単位(テストクラス名)
+    screen: str = ""
+
+    @property
+    def name(self) -> str:
+        return f"{self.screen} {self.method} {self.url}".strip()
+
+
+@dataclass
+class LoadResult:
+    """1つのリクエストに対する負荷テストの結果"""
+
+    name: str
+    # 各リクエストの所要時間(秒)
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    # 全体の所要時間(秒)
+    elapsed: float = 0.0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """1秒あたりのリクエスト数"""
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, p: float) -> float:
+        """所要時間のパーセンタイル(nearest-rank法)"""
+        if not self.latencies:
+            return 0.0
+
+        ordered = sorted(self.latencies)
+        return ordered[max(math.ceil(p / 100 * len(ordered)) - 1, 0)]
+
+
+def to_post_data(inputs: Dict) -> Dict:
+    """フォームに入れる値(maximum_inputs など)を、POSTするデータに変換する
+
+    webtestのフォームと違い、チェックされていないチェックボックスは送らない。
+    """
+    data = {}
+    for key, value in prepare_inputs(inputs).items():
+        if isinstance(value, list):
+            # MultipleSelectの場合
+            data[key] = [v.pk for v in value]
+        elif isinstance(value, Model):
+            data[key] = value.pk
+        elif isinstance(value, UploadFile):
+            data[key] = SimpleUploadedFile(value.filename, value.contents)
+        elif isinstance(value, bool):
+            if value:
+                data[key] = "on"
+        else:
+            data[key] = value
+
+    return data
+
+
+def collect_load_requests(test_classes: Iterable[type]) -> List[LoadRequest]:
+    """GenericTest* を継承したテストクラスから、負荷テストで送るリクエストを集める(フィクスチャーはここで作成される)"""
+    requests = []
+    for test_class in test_classes:
+        test = test_class()
+        for request in test.get_load_requests():
+            requests.append(replace(request, screen=test_class.__name__))
+
+    return requests
+
+
+def create_load_session() -> str:
+    """Auth0LoginRequiredMixin を通過できるユーザーでログインし、セッションのキーを返す
+
+    各スレッドでログインすると、セッションの書き込みが競合するため、最初に1回だけログインしておく。
+    """
+    user = get_user_model().objects.create_user(username="loadtest")
+    UserSocialAuth.objects.create(user=user, provider="auth0", uid="loadtest")
+
+    client = Client()
+    client.force_login(user)
+    return client.session.session_key
+
+
+class ClientTransport:
+    """WSGIアプリケーションをプロセス内で直接呼び出す(スレッドごとに作成する)"""
+
+    def __init__(self, session_key: str):
+        self.client = Client(raise_request_exception=False)
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = session_key
+
+    def prepare(self, request: LoadRequest):
+        pass
+
+    def send(self, request: LoadRequest) -> int:
+        if request.method == "POST":
+            response = self.client.post(request.url, to_post_data(request.data or {}))
+        else:
+            response = self.client.generic(request.method, request.url)
+
+        # ストリーミングのレスポンスも最後まで読む
+        if response.streaming:
+            b"".join(response.streaming_content)
+
+        return response.status_code
+
+
+class _NoRedirect(HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class HttpTransport:
+    """起動済みのサーバーにHTTPでリクエストを送る(スレッドごとに作成する)"""
+
+    def __init__(self, base_url: str, session_key: str):
+        self.base_url = base_url.rstrip("/")
+        self.cookies = {settings.SESSION_COOKIE_NAME: session_key}
+        self.opener = build_opener(_NoRedirect)
+
+    def _open(self, method: str, url: str, body: bytes = None, headers: Dict = None) -> int:
+        headers = {"Cookie": "; ".join(f"{k}={v}" for k, v in self.cookies.items()), **(headers or {})}
+        request = Request(self.base_url + url, data=body, headers=headers, method=method)
+        try:
+            response = self.opener.open(request)
+        except HTTPError as e:
+            # リダイレクトもここに来る
+            response = e
+
+        with response:
+            response.read()
+            for header in response.headers.get_all("Set-Cookie") or ():
+                self.cookies.update({key: morsel.value for key, morsel in SimpleCookie(header).items()})
+
+            return response.status
+
+    def prepare(self, request: LoadRequest):
+        # POSTの前に、フォームの画面からCSRFのトークン(Cookie)を受け取っておく
+        if request.method == "POST" and settings.CSRF_COOKIE_NAME not in self.cookies:
+            self._open("GET", request.url)
+
+    def send(self, request: LoadRequest) -> int:
+        if request.method != "POST":
+            return self._open(request.method, request.url)
+
+        headers = {
+            "Content-Type": MULTIPART_CONTENT,
+            settings.CSRF_HEADER_NAME.removeprefix("HTTP_").replace("_", "-"): self.cookies.get(
+                settings.CSRF_COOKIE_NAME, ""
+            ),
+        }
+        body = encode_multipart(BOUNDARY, to_post_data(request.data or {}))
+        return self._open("POST", request.url, body, headers)
+
+
+@contextmanager
+def live_server(host: str = "localhost", port: int = 0):
+    """LiveServerTestCase と同じく、別スレッドでサーバーを起動してそのURLを返す"""
+    # インメモリのSQLiteは、サーバーのスレッドと接続を共有する
+    connections_override = {
+        conn.alias: conn for conn in connections.all() if conn.vendor == "sqlite" and conn.is_in_memory_db()
+    }
+    for conn in connections_override.values():
+        conn.inc_thread_sharing()
+
+    with modify_settings(ALLOWED_HOSTS={"append": host}):
+        server = LiveServerThread(host, lambda handler: handler, connections_override, port)
+        server.daemon = True
+        server.start()
+        try:
+            server.is_ready.wait()
+            if server.error:
+                raise server.error
+
+            yield f"http://{server.host}:{server.port}"
+        finally:
+            server.terminate()
+            for conn in connections_override.values():
+                conn.dec_thread_sharing()
+
+
+def _run_worker(transport_factory: Callable, request: LoadRequest, iterations: int) -> Tuple[List[float], int]:
+    latencies = []
+    errors = 0
+    try:
+        transport = transport_factory()
+        transport.prepare(request)
+        for _ in range(iterations):
+            start = time.perf_counter()
+            try:
+                status = transport.send(request)
+            except Exception:
+                status = None
+
+            latencies.append(time.perf_counter() - start)
+            if status is None or status >= 400:
+                errors += 1
+    finally:
+        # リクエストと同じように、スレッドのDB接続を後始末する
+        connections.close_all()
+
+    return latencies, errors
+
+
+def run_load(
+    request: LoadRequest, transport_factory: Callable, concurrency: int = 4, iterations: int = 10
+) -> LoadResult:
+    """1つのリクエストを、concurrency個のスレッドからそれぞれiterations回送り、結果を集計する
+
+    transport_factory() は、ワーカーのスレッドごとに呼ばれる。
+    """
+    result = LoadResult(name=request.name)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="loadtest") as executor:
+        futures = [executor.submit(_run_worker, transport_factory, request, iterations) for _ in range(concurrency)]
+        for future in futures:
+            latencies, errors = future.result()
+            result.latencies.extend(latencies)
+            result.errors += errors
+
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def format_results(results: List[LoadResult]) -> List[str]:
+    """結果を表形式の行にする(所要時間はミリ秒)"""
+    width = max([len(result.name) for result in results] + [len("screen")])
+    lines = [f"{'screen':<{width}} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50':>8} {'p90':>8} {'p99':>8}"]
+    for result in results:
+        lines.append(
+            f"{result.name:<{width}} {result.requests:>8} {result.error_rate:>6.1%} {result.throughput:>8.1f}"
+            f" {result.percentile(50) * 1000:>8.1f} {result.percentile(90) * 1000:>8.1f}"
+            f" {result.percentile(99) * 1000:>8.1f}"
+        )
+
+    return lines
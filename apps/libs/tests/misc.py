@@ -2,10 +2,11 @@ from typing import Dict, Tuple
 
 import pytest
 
+from apps.libs.tests.html import select
 from apps.libs.tests.utils import ObjectItemList
 
 
-@pytest.mark.django_db(transaction=True)
+@pytest.mark.django_db
 class GenericTestFilter:
     url = None
     patterns: Tuple[Dict, Tuple] = None
@@ -37,12 +38,12 @@ class GenericTestFilter:
 
         # 結果の検証
         selector = "#object-list li"
-        item_list = ObjectItemList(res.html.select(selector))
+        item_list = ObjectItemList(select(res, selector))
         expected_instances = [instances[expected_index] for expected_index in expected_indexes]
         expected_links = [self.get_anchor_link(instance) for instance in expected_instances]
         assert sorted(item_list.links()) == sorted(expected_links)  # TODO: 順番も含めて検証
 
 
-@pytest.mark.django_db(transaction=True)
+@pytest.mark.django_db
 class GenericTestSort:
     pass
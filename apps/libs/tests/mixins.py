@@ -1,7 +1,8 @@
+from apps.libs.tests.html import select
 from apps.libs.tests.utils import (
     ObjectItemList,
     _get_last_record,
-    _normalize_for_display,
+    _normalize_many_for_display,
     _normalize_record,
     _set_form,
     get_heading,
@@ -38,15 +39,15 @@ class SingleInstanceTestMixin:
         res = auth0_app.get(url)
         assert res.status_code == 200
 
-        item_list = ObjectItemList(res.html.select("dl > dd"))
+        item_list = ObjectItemList(select(res, "dl > dd"))
         texts = item_list.texts()
-        expected_texts = []
+        attrs = []
         for display_key in display_keys:
             if hasattr(instance, f"get_{display_key}_display"):
-                attr = getattr(instance, f"get_{display_key}_display")()
+                attrs.append(getattr(instance, f"get_{display_key}_display")())
             else:
-                attr = getattr(instance, display_key)
-            expected_texts.append(_normalize_for_display(attr))
+                attrs.append(getattr(instance, display_key))
+        expected_texts = _normalize_many_for_display(attrs)
 
         assert texts == expected_texts, "表示内容が正しいこと"
 
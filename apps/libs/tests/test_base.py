@@ -0,0 +1,24 @@
+from django.db import connection, transaction
+
+from apps.libs.tests import GenericTestEdit, GenericTransactionTest
+
+
+class TestTransactionTest(GenericTransactionTest):
+    def test_transactional(self, request):
+        assert "transactional_db" in request.fixturenames
+
+        # テストがatomicブロックで囲まれていなければ、on_commitはすぐに実行される
+        assert not connection.in_atomic_block
+        called = []
+        transaction.on_commit(lambda: called.append(True))
+        assert called
+
+
+class TestTransactionEdit(GenericTransactionTest, GenericTestEdit):
+    # GenericTestEditのテスト(model_factoryなどが必要)は実行しない
+    test_display = test_edit = test_invalid_value = test_not_found = None
+
+    def test_transactional(self, request):
+        assert request.node.get_closest_marker("django_db").kwargs == {}
+        assert "transactional_db" in request.fixturenames
+        assert not connection.in_atomic_block
@@ -1,6 +1,7 @@
 import pytest
+from django.contrib.auth.models import User
 
-from apps.libs.collections import as_list
+from apps.libs.collections import as_list, duplicated_objects, iter_duplicated_objects
 
 
 @pytest.mark.parametrize(
@@ -15,3 +16,24 @@ from apps.libs.collections import as_list
 )
 def test_as_list(x, expected):
     assert as_list(x) == expected
+
+
+def test_duplicated_objects():
+    assert duplicated_objects([3, 1, 2, 1, 3, 3]) == [3, 1]
+    assert duplicated_objects(iter("abcb")) == ["b"]
+    assert duplicated_objects([]) == []
+
+
+def test_iter_duplicated_objects():
+    # 2回目に現れた順に、1回だけ返す
+    assert list(iter_duplicated_objects(iter([3, 1, 2, 1, 3, 3]))) == [1, 3]
+
+
+@pytest.mark.django_db
+def test_iter_duplicated_objects_queryset():
+    for name in ("a", "b", "c"):
+        User.objects.create(username=name, first_name=name.replace("c", "a"))
+
+    names = User.objects.values_list("first_name", flat=True).order_by("pk")
+    assert list(iter_duplicated_objects(names)) == ["a"]
+    assert names._result_cache is None, "QuerySetの結果をキャッシュしないこと"
@@ -0,0 +1,62 @@
+import threading
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.contrib.auth.models import User
+from django.urls import get_script_prefix, set_script_prefix
+from django.utils import timezone, translation
+
+from apps.libs import concurrent
+from apps.libs.concurrent import run_concurrently
+
+
+def test_run_concurrently():
+    main_thread = threading.get_ident()
+    results = run_concurrently({"a": threading.get_ident, "b": threading.get_ident, "c": lambda: 3})
+
+    # 1つ目は呼び出し元のスレッド、残りはスレッドプールで実行される
+    assert results["a"] == main_thread
+    assert results["b"] != main_thread
+    assert results["c"] == 3
+
+
+@pytest.mark.django_db
+def test_run_concurrently_in_transaction():
+    User.objects.create(username="a")
+    main_thread = threading.get_ident()
+
+    # コミット前のデータを参照できるよう、トランザクション中は呼び出し元のスレッドで実行される
+    results = run_concurrently({"count": User.objects.count, "thread": threading.get_ident})
+    assert results == {"count": 1, "thread": main_thread}
+
+
+def test_run_concurrently_reuses_connections(monkeypatch):
+    close_old_connections = mock.Mock()
+    close_all = mock.Mock()
+    monkeypatch.setattr(concurrent, "close_old_connections", close_old_connections)
+    monkeypatch.setattr(concurrent.connections, "close_all", close_all)
+
+    # ワーカーの接続は毎回閉じず、CONN_MAX_AGE に従って開始時と終了時に後始末する
+    run_concurrently({"a": lambda: 1, "b": lambda: 2, "c": lambda: 3})
+    assert close_old_connections.call_count == 4
+    close_all.assert_not_called()
+
+
+def test_run_concurrently_request_locals():
+    def get_locals():
+        return translation.get_language(), timezone.get_current_timezone_name(), get_script_prefix()
+
+    set_script_prefix("/prefix/")
+    try:
+        with translation.override("en"), timezone.override(ZoneInfo("UTC")):
+            results = run_concurrently({"main": get_locals, "worker": get_locals})
+    finally:
+        set_script_prefix("/")
+
+    # ワーカーのスレッドでも、呼び出し元の言語、タイムゾーン、プレフィックスが有効になる
+    assert results["worker"] == results["main"] == ("en", "UTC", "/prefix/")
+
+    # 実行後のワーカーは元に戻る
+    results = run_concurrently({"main": get_locals, "worker": get_locals})
+    assert results["worker"] == results["main"]
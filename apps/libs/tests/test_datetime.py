@@ -0,0 +1,115 @@
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from apps.libs.datetime import (
+    _utc_day_offset,
+    bucket_by_month,
+    get_month_names,
+    get_short_weekday,
+    get_weekday_names,
+    label_months,
+    label_weekdays,
+    local_dates,
+    localize_datetime64,
+    localize_many,
+    make_jst,
+    make_jst_many,
+    preload_names,
+)
+
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+def test_get_weekday_names():
+    assert get_weekday_names() == ("月", "火", "水", "木", "金", "土", "日")
+    assert get_weekday_names("wide")[0] == "月曜日"
+    assert get_weekday_names("abbreviated", "en_US")[6] == "Sun"
+
+    # 2回目以降は同じタプルを返す
+    assert get_weekday_names() is get_weekday_names()
+    assert get_short_weekday(6) == "日"
+
+
+def test_get_month_names():
+    assert get_month_names()[0] == "1月"
+    assert get_month_names("abbreviated", "en_US")[11] == "Dec"
+
+
+def test_label_dates():
+    dates = [date(2021, 6, 10), date(2021, 6, 13), date(2021, 12, 1)]
+
+    assert label_weekdays(dates) == ["木", "日", "水"]
+    assert label_months(dates) == ["6月", "6月", "12月"]
+
+
+def test_preload_names(settings):
+    settings.DATETIME_NAME_LOCALES = ["en_US"]
+    preload_names()
+
+    from apps.libs import datetime
+
+    assert ("en_US", "days", "short") in datetime._NAMES
+    assert ("en_US", "months", "narrow") in datetime._NAMES
+
+
+def test_make_jst():
+    expected = datetime(2021, 6, 9, 15, tzinfo=dt_timezone.utc)
+
+    assert make_jst(datetime(2021, 6, 10)) == expected
+    assert make_jst_many([datetime(2021, 6, 10)]) == [expected]
+
+    # awareなdatetimeは、どちらもエラー
+    with pytest.raises(ValueError):
+        make_jst(expected)
+    with pytest.raises(ValueError):
+        make_jst_many([datetime(2021, 6, 10), expected])
+
+
+def test_localize_many():
+    values = [datetime(2021, 6, 9, 15, tzinfo=dt_timezone.utc), None]
+
+    localized = localize_many(values)
+    assert localized[0].replace(tzinfo=None) == datetime(2021, 6, 10)
+    assert localized[0].utcoffset() == timedelta(hours=9)
+    assert localized[1] is None
+    assert local_dates(values) == [date(2021, 6, 10), None]
+
+    with pytest.raises(ValueError):
+        localize_many([datetime(2021, 6, 10)])
+
+
+def test_bucket_by_month():
+    values = [
+        datetime(2021, 5, 31, 15, tzinfo=dt_timezone.utc),  # 日本時間では6月
+        datetime(2021, 5, 31, 14, tzinfo=dt_timezone.utc),
+        None,
+        datetime(2021, 6, 1, tzinfo=dt_timezone.utc),
+    ]
+
+    assert bucket_by_month(values) == {(2021, 6): [values[0], values[3]], (2021, 5): [values[1]]}
+    assert bucket_by_month(values, tz=dt_timezone.utc) == {(2021, 5): values[:2], (2021, 6): [values[3]]}
+    assert bucket_by_month([{"d": date(2021, 1, 2)}], key=lambda row: row["d"]) == {
+        (2021, 1): [{"d": date(2021, 1, 2)}]
+    }
+
+
+def test_utc_day_offset():
+    assert _utc_day_offset(NEW_YORK, date(2021, 3, 13)) == timedelta(hours=-5)
+
+    # 夏時間に切り替わる日(UTCの7時)
+    assert _utc_day_offset(NEW_YORK, date(2021, 3, 14)) is None
+
+
+def test_localize_datetime64():
+    np = pytest.importorskip("numpy")
+
+    values = np.array(["2021-03-14T06:00", "2021-03-14T08:00", "2021-06-01T00:00", "NaT"], dtype="datetime64[us]")
+    results = localize_datetime64(values, NEW_YORK)
+
+    expected = ["2021-03-14T01:00", "2021-03-14T04:00", "2021-05-31T20:00", "NaT"]
+    assert (results[:3] == np.array(expected[:3], dtype="datetime64[us]")).all()
+    assert np.isnat(results[3])
+    assert results.astype("datetime64[M]")[2] == np.datetime64("2021-05")
@@ -0,0 +1,34 @@
+from django.contrib.auth.models import User
+from django.db.models import ManyToManyField
+from social_django.models import UserSocialAuth
+
+from apps.libs.db.introspection import get_model_descriptor
+
+
+def test_get_model_descriptor():
+    descriptor = get_model_descriptor(UserSocialAuth)
+
+    # モデルごとに1度だけ作成する
+    assert get_model_descriptor(UserSocialAuth) is descriptor
+
+    assert descriptor.fields == tuple(UserSocialAuth._meta.fields)
+    assert descriptor.display_fields == descriptor.fields
+    # 自動生成されたid以外(auto_nowなど編集できないフィールドも含む)
+    assert list(descriptor.declared_fields) == [f.name for f in UserSocialAuth._meta.fields if not f.auto_created]
+    assert "id" not in descriptor.declared_fields
+    assert {"user", "created", "modified"} <= set(descriptor.declared_fields)
+    assert descriptor.admin_fields == descriptor.declared_fields
+    assert descriptor.reverse_relations == ()
+
+
+def test_get_model_descriptor_many_to_many():
+    descriptor = get_model_descriptor(User)
+    declared_fields = [f.name for f in User._meta.get_fields() if not f.auto_created]
+
+    assert list(descriptor.declared_fields) == declared_fields
+    assert {"groups", "user_permissions"} <= set(declared_fields)
+    # 管理画面のフィールドには多対多を含めない
+    assert list(descriptor.admin_fields) == [
+        name for name in declared_fields if not isinstance(User._meta.get_field(name), ManyToManyField)
+    ]
+    assert "social_auth" in [relation.name for relation in descriptor.reverse_relations]
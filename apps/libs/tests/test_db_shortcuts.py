@@ -0,0 +1,170 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.contrib.auth.models import Group, User
+from social_django.models import UserSocialAuth
+
+from apps.libs.db import shortcuts
+from apps.libs.db.shortcuts import (
+    _cached_custom_order,
+    qs_custom_order,
+    qs_duplicated_values,
+    qs_keyset_page,
+    qs_last_by,
+    qs_reverse_counts,
+    qs_value_list_flat_client_side,
+)
+
+
+@pytest.mark.django_db
+def test_qs_duplicated_values():
+    for username, first_name, last_name in (("a", "x", "1"), ("b", "x", "1"), ("c", "x", "2"), ("d", "y", "1")):
+        User.objects.create(username=username, first_name=first_name, last_name=last_name)
+
+    assert list(qs_duplicated_values(User.objects.all(), "first_name")) == [{"first_name": "x", "duplicate_count": 3}]
+    assert list(qs_duplicated_values(User.objects.all(), "first_name", "last_name")) == [
+        {"first_name": "x", "last_name": "1", "duplicate_count": 2}
+    ]
+    assert not qs_duplicated_values(User.objects.filter(username__in=["a", "d"]), "first_name").exists()
+
+    # 件数の名前を変更する
+    assert list(qs_duplicated_values(User.objects.all(), "last_name", count_name="n")) == [{"last_name": "1", "n": 3}]
+
+    # スライス済みの場合は、その範囲で集計する
+    assert list(qs_duplicated_values(User.objects.order_by("username")[1:], "first_name")) == [
+        {"first_name": "x", "duplicate_count": 2}
+    ]
+
+
+@pytest.fixture
+def users():
+    # first_nameが同じユーザーを含む
+    return [
+        User.objects.create(username=username, first_name=first_name)
+        for username, first_name in (("a", "y"), ("b", "x"), ("c", "y"), ("d", "x"))
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("ordering", ["pk", "-pk", "username", "-username"])
+def test_qs_last_by(users, ordering, django_assert_num_queries):
+    qs = User.objects.order_by(ordering)
+
+    # DB側で取得しても、Pythonでソートした場合(元の並び順で最後のもの)と同じ
+    expected = qs_last_by(list(qs), "first_name")
+    with django_assert_num_queries(1):
+        assert qs_last_by(qs.all(), "first_name") == expected
+
+    assert qs_last_by(User.objects.order_by("-pk"), "first_name").username == "a"
+    assert qs_last_by(User.objects.none(), "first_name") is None
+
+
+@pytest.mark.django_db
+def test_qs_last_by_sliced(users):
+    qs = User.objects.order_by("pk")[:2]
+
+    assert qs_last_by(qs, "first_name").username == "a"
+    assert qs_last_by(qs, "first_name") == qs_last_by(list(qs), "first_name")
+
+
+@pytest.mark.django_db
+def test_qs_value_list_flat_client_side(users, django_assert_num_queries):
+    qs = User.objects.order_by("pk")
+    for user in users:
+        user.social_auth.create(provider="auth0", uid=user.username)
+
+    with django_assert_num_queries(1):
+        assert qs_value_list_flat_client_side(qs.all(), "first_name") == ["y", "x", "y", "x"]
+
+    # 外部キーをたどる場合も1回のクエリで取得する(評価済みの場合と同じ結果)
+    social_auths = UserSocialAuth.objects.order_by("pk")
+    expected = qs_value_list_flat_client_side(list(social_auths), "user__username")
+    with django_assert_num_queries(1):
+        assert qs_value_list_flat_client_side(social_auths.all(), "user__username") == expected == ["a", "b", "c", "d"]
+
+    # スライス済みの場合
+    assert qs_value_list_flat_client_side(qs[1:3], "username") == ["b", "c"]
+
+
+@pytest.mark.django_db
+def test_qs_custom_order(users, monkeypatch):
+    _cached_custom_order.cache_clear()
+    sort_order = ("c", "a", "d", "b")
+
+    # 短い場合はCase(When(...))
+    qs = qs_custom_order(User.objects.all(), "username", sort_order)
+    assert "CASE" in str(qs.query)
+    assert [user.username for user in qs] == ["c", "a", "d", "b"]
+
+    # 同じ (key, sort_order) の式は使い回す
+    qs_custom_order(User.objects.all(), "username", list(sort_order))
+    assert _cached_custom_order.cache_info().hits == 1
+
+    # 長い場合はVALUESリスト(同じ値は最初の位置だけを残す)
+    monkeypatch.setattr(shortcuts, "CUSTOM_ORDER_CASE_MAX_LENGTH", 2)
+    qs = qs_custom_order(User.objects.all(), "username", ("c", "a", "c", "d", "a", "b"))
+    sql, params = qs.query.sql_with_params()
+    assert "VALUES" in sql and "CASE" not in sql
+    assert params == ("c", "a", "d", "b")
+    assert [user.username for user in qs] == ["c", "a", "d", "b"]
+
+
+@pytest.mark.django_db
+def test_qs_custom_order_unhashable(users, monkeypatch):
+    # ハッシュできない値(リスト)の場合はキャッシュせずに作る
+    sort_order = (["b"], ["a"])
+    qs = qs_custom_order(User.objects.filter(username__in=["a", "b"]), "username", sort_order)
+
+    assert "CASE" in str(qs.query)
+
+    # 長い場合もCase(When(...))を使う
+    monkeypatch.setattr(shortcuts, "CUSTOM_ORDER_CASE_MAX_LENGTH", 1)
+    qs = qs_custom_order(User.objects.filter(username__in=["a", "b"]), "username", sort_order)
+    assert "CASE" in str(qs.query)
+
+
+@pytest.mark.django_db
+def test_qs_custom_order_none(users, monkeypatch):
+    logins = [datetime(2021, 1, day, tzinfo=timezone.utc) for day in (1, 2, 3)]
+    for user, last_login in zip(users, logins):
+        user.last_login = last_login
+        user.save()
+
+    # NULLはVALUESリストと一致しないため、長い場合もCase(When(...))(IS NULL)を使う
+    monkeypatch.setattr(shortcuts, "CUSTOM_ORDER_CASE_MAX_LENGTH", 2)
+    qs = qs_custom_order(User.objects.all(), "last_login", (logins[2], None, logins[0], logins[1]))
+    sql = str(qs.query)
+    assert "CASE" in sql and "VALUES" not in sql
+    assert [user.username for user in qs] == ["c", "d", "a", "b"]
+
+
+@pytest.mark.django_db
+def test_qs_keyset_page(users):
+    page = qs_keyset_page(User.objects.order_by("-pk"), size=3)
+    assert [user.username for user in page.object_list] == ["a", "b", "c"]
+    assert page.next_after == users[2].pk
+
+    page = qs_keyset_page(User.objects.values("pk", "username"), after=page.next_after, size=3)
+    assert [row["username"] for row in page.object_list] == ["d"]
+    assert page.next_after is None
+
+    # ちょうど最後のページの場合
+    assert qs_keyset_page(User.objects.all(), size=4).next_after is None
+
+
+@pytest.mark.django_db
+def test_qs_reverse_counts(users, django_assert_num_queries):
+    UserSocialAuth.objects.create(user=users[0], provider="auth0", uid="a")
+    UserSocialAuth.objects.create(user=users[0], provider="b", uid="a")
+    relations = [User._meta.get_field("social_auth")]
+
+    with django_assert_num_queries(1):
+        assert qs_reverse_counts(users[0], relations) == {"social_auth": 2}
+
+    assert qs_reverse_counts(users[1], relations) == {"social_auth": 0}
+    assert qs_reverse_counts(users[0], []) == {}
+
+    # 多対多の逆参照
+    group = Group.objects.create(name="g")
+    group.user_set.add(users[0], users[1])
+    assert qs_reverse_counts(group, [Group._meta.get_field("user")]) == {"user": 2}
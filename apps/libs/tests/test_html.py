@@ -0,0 +1,51 @@
+import pytest
+
+from apps.libs.tests.html import get_html_parser, parse_html, select, select_one
+from apps.libs.tests.utils import ObjectItemList
+
+HTML = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>一覧</title></head>
+<body>
+<ul id="object-list">
+  <li class="item first"><a href="/detail/1/?next=/list/">ア&amp;イ</a><a href="#">…</a><a href="/edit/1/">編集</a></li>
+  <li>テキスト</li>
+</ul>
+<div class="perspectives"><a data-perspective="name">名前</a></div>
+</body>
+</html>
+"""
+
+
+class Response:
+    testbody = HTML
+
+
+@pytest.mark.parametrize("parser", ("lxml", "bs4"))
+def test_select(settings, parser):
+    settings.TEST_HTML_PARSER = parser
+    res = Response()
+
+    assert select_one(res, "title").get_text() == "一覧"
+    assert [anchor["data-perspective"] for anchor in select(res, ".perspectives a")] == ["name"]
+    assert select_one(res, "#object-list > li a").get("class") is None
+
+    # classなどはBeautifulSoupと同じくリストになる
+    assert select_one(res, "#object-list > li")["class"] == ["item", "first"]
+    assert select_one(res, "#object-list > li a")["href"] == "/detail/1/?next=/list/"
+
+    item_list = ObjectItemList(select(res, "#object-list > li"))
+    assert item_list.anchor_texts() == ["ア&イ", "テキスト"]
+    assert item_list[0].all_links() == ["/detail/1/", "/edit/1/"]
+
+    # 解析は1回だけ
+    assert parse_html(res) is parse_html(res)
+
+
+def test_get_html_parser(settings):
+    # デフォルトはBeautifulSoup(lxmlは明示的に指定した場合のみ)
+    del settings.TEST_HTML_PARSER
+    assert get_html_parser() == "bs4"
+
+    settings.TEST_HTML_PARSER = "lxml"
+    assert get_html_parser() == "lxml"
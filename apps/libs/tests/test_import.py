@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+
+import apps.libs
+
+# 読み込みに時間がかかるため、使うときまで読み込まないモジュール
+HEAVY_MODULES = {"babel", "dateutil", "django_filters", "numpy", "pytest", "pytz", "social_django"}
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(apps.libs.__file__)))
+
+
+def import_time(*modules: str) -> dict:
+    """新しいプロセスで `python -X importtime` を実行し、{モジュール名: 累積の読み込み時間(マイクロ秒)} を返す"""
+    code = "; ".join(f"import {module}" for module in modules)
+    env = dict(os.environ, PYTHONPATH=ROOT_DIR)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=ROOT_DIR, env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.removeprefix("import time:").split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def test_import_light():
+    times = import_time(
+        "apps.libs.views", "apps.libs.tests", "apps.libs.str", "apps.libs.collections", "apps.libs.datetime"
+    )
+
+    imported = {name.split(".")[0] for name in times}
+    assert not imported & HEAVY_MODULES
+
+    # Viewのモジュールは、使われるまで読み込まない
+    assert "apps.libs.views.list" not in times
+
+
+def test_import_lazy():
+    from apps.libs import views
+
+    assert views.GenericListView.__module__ == "apps.libs.views.list"
+    assert "GenericFilterView" in dir(views)
@@ -0,0 +1,27 @@
+import json
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from apps.libs.json import dumps, stream_json_list
+
+
+def test_dumps_matches_django_json_encoder():
+    data = {
+        "aware": datetime(2021, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+        "naive": datetime(2021, 1, 2, 3, 4, 5, 678901),
+        "date": date(2021, 1, 2),
+        "time": time(3, 4, 5, 678901),
+        "duration": timedelta(days=1, seconds=2),
+        "decimal": Decimal("1.50"),
+    }
+
+    # 日時の形式もDjangoJSONEncoderと同じ(ミリ秒まで、UTCは "Z")
+    assert json.loads(dumps(data)) == json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+    assert json.loads(dumps(data))["aware"] == "2021-01-02T03:04:05.678Z"
+
+
+def test_stream_json_list():
+    assert b"".join(stream_json_list([])) == b"[]"
+    assert json.loads(b"".join(stream_json_list({"i": i} for i in range(250)))) == [{"i": i} for i in range(250)]
@@ -0,0 +1,109 @@
+import pytest
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.urls import path
+from django.views import View
+
+from apps.libs.auth.mixins import Auth0LoginRequiredMixin
+from apps.libs.factory import UploadFile
+from apps.libs.tests.list import GenericTestList
+from apps.libs.tests.load import (
+    ClientTransport,
+    HttpTransport,
+    LoadRequest,
+    LoadResult,
+    collect_load_requests,
+    create_load_session,
+    format_results,
+    live_server,
+    run_load,
+    to_post_data,
+)
+
+
+class EchoView(Auth0LoginRequiredMixin, View):
+    def get(self, request):
+        # フォームの画面と同じく、CSRFのCookieを発行する
+        return HttpResponse(get_token(request))
+
+    def post(self, request):
+        return HttpResponse(request.POST["name"])
+
+
+urlpatterns = [
+    path("echo/", EchoView.as_view()),
+    path("error/", lambda request: 1 / 0),
+]
+
+
+class UserListTest(GenericTestList):
+    url = "/echo/"
+    perspective_keys = ("a",)
+
+    def get_fixture(self):
+        return [User.objects.create(username="a")]
+
+
+def test_load_result():
+    result = LoadResult(name="a", latencies=[i / 1000 for i in range(1, 101)], errors=5, elapsed=2.0)
+
+    assert result.requests == 100
+    assert result.error_rate == 0.05
+    assert result.throughput == 50.0
+    assert result.percentile(50) == 0.05
+    assert result.percentile(99) == 0.099
+    assert LoadResult(name="b").percentile(50) == 0.0
+
+
+def test_to_post_data():
+    user = User(pk=1)
+    data = to_post_data({"a": "x", "b": user, "c": [user], "d": True, "e": False, "f": UploadFile("a.txt", b"a")})
+
+    assert {k: data[k] for k in "abcd"} == {"a": "x", "b": 1, "c": [1], "d": "on"}
+    assert "e" not in data
+    assert data["f"].read() == b"a"
+
+
+@pytest.mark.django_db
+def test_collect_load_requests():
+    requests = collect_load_requests([UserListTest])
+
+    assert [request.name for request in requests] == [
+        "UserListTest GET /echo/",
+        "UserListTest GET /echo/?perspective=a",
+    ]
+    assert User.objects.filter(username="a").exists()
+
+
+@pytest.mark.urls(__name__)
+@pytest.mark.django_db(transaction=True)
+def test_run_load():
+    session_key = create_load_session()
+
+    result = run_load(LoadRequest("/echo/"), lambda: ClientTransport(session_key), concurrency=2, iterations=3)
+    assert result.requests == 6
+    assert result.errors == 0
+
+    result = run_load(LoadRequest("/echo/", "POST", {"name": "a"}), lambda: ClientTransport(session_key), 2, 3)
+    assert result.errors == 0
+
+    result = run_load(LoadRequest("/error/"), lambda: ClientTransport(session_key), 1, 2)
+    assert result.error_rate == 1.0
+
+    lines = format_results([result])
+    assert lines[1].split()[:3] == ["GET", "/error/", "2"]
+
+
+@pytest.mark.urls(__name__)
+@pytest.mark.django_db(transaction=True)
+def test_run_load_live_server():
+    session_key = create_load_session()
+
+    with live_server() as base_url:
+        result = run_load(LoadRequest("/echo/"), lambda: HttpTransport(base_url, session_key), 2, 2)
+        assert (result.requests, result.errors) == (4, 0)
+
+        # CSRFのトークンを受け取ってからPOSTする
+        result = run_load(LoadRequest("/echo/", "POST", {"name": "a"}), lambda: HttpTransport(base_url, session_key))
+        assert result.errors == 0
@@ -1,4 +1,7 @@
-from apps.libs.path import random_filepath
+import os
+import stat
+
+from apps.libs.path import random_filepath, write_file_atomic
 
 
 def test_random_filename():
@@ -6,3 +9,34 @@ def test_random_filename():
     generated = f("original_filename.png")
     assert generated.startswith("base/")
     assert len(generated) == 5 + 64 + 4, "`base/` + ランダムな文字列(64文字) + 拡張子(`.png`)"
+
+
+def test_write_file_atomic(tmp_path):
+    path = str(tmp_path / "a.py")
+    assert write_file_atomic(path, "あ") is True
+    assert open(path, encoding="utf-8").read() == "あ"
+
+    # 内容が同じ場合は書き込まない
+    mtime = os.stat(path).st_mtime_ns
+    assert write_file_atomic(path, "あ") is False
+    assert os.stat(path).st_mtime_ns == mtime
+
+    assert write_file_atomic(path, "い") is True
+    assert open(path, encoding="utf-8").read() == "い"
+    assert os.listdir(tmp_path) == ["a.py"], "一時ファイルが残っていないこと"
+
+
+def test_write_file_atomic_mode(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        # 新しいファイルは、通常の書き込みと同じパーミッション
+        path = tmp_path / "a.py"
+        write_file_atomic(str(path), "a")
+        assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+        # 既存のファイルはパーミッションを引き継ぐ
+        path.chmod(0o755)
+        write_file_atomic(str(path), "b")
+        assert stat.S_IMODE(path.stat().st_mode) == 0o755
+    finally:
+        os.umask(umask)
@@ -1,3 +1,5 @@
+import json
+from io import StringIO
 from unittest.mock import patch
 
 import pytest
@@ -18,6 +20,10 @@ class TestScaffold(GenericTest):
             ("start_time:datetime", 'start_time = DateTimeField(verbose_name="")'),
             ("note:text", 'note = TextField(verbose_name="")'),
             ("is_active:bool", 'is_active = BooleanField(verbose_name="")'),
+            ("price:int", 'price = IntegerField(verbose_name="")'),
+            ("amount:decimal", 'amount = DecimalField(max_digits=12, decimal_places=2, verbose_name="")'),
+            ("order_status:choice", 'order_status = IntegerField(choices=FooOrderStatus.choices, verbose_name="")'),
+            ("parent:fk:Parent", 'parent = ForeignKey("Parent", on_delete=PROTECT, verbose_name="")'),
         ),
     )
     def test_it(self, field, expected_field):
@@ -79,3 +85,55 @@ class TestScaffold(GenericTest):
 
         # test_models.py
         assert "class TestFoo(GenericTestModel)" in test_models_py
+
+    def test_perf(self):
+        with patch("apps.libs.management.commands.scaffold.Command.exec") as m:
+            call_command("scaffold", "apps.foo", "Foo", "start_date:date", "parent:fk:Parent", "--perf")
+
+        args, kwargs = m.call_args_list[0]
+        models_py, views_py = args[3], args[5]
+
+        # 参照している型のみインポートし、キャッシュのためにupdated_atを追加する
+        assert "from django.db.models import PROTECT, DateField, DateTimeField, ForeignKey\n" in models_py
+        assert 'updated_at = DateTimeField(verbose_name="更新日時", auto_now=True)' in models_py
+        assert 'models.Index(fields=["start_date"])' in models_py
+        assert 'models.Index(fields=["updated_at"])' in models_py
+        assert 'models.Index(fields=["parent"])' not in models_py, "ForeignKeyはDjangoがインデックスを作成する"
+
+        assert views_py.count('queryset = Foo.objects.select_related("parent")') == 2
+        assert 'row_cache_version_field = "updated_at"' in views_py
+
+        assert "class TestFooQueryBudget(GenericTest)" in kwargs["test_perf_py"]
+        assert "django_assert_max_num_queries(LIST_QUERY_BUDGET)" in kwargs["test_perf_py"]
+
+    def test_without_perf(self):
+        with patch("apps.libs.management.commands.scaffold.Command.exec") as m:
+            call_command("scaffold", "apps.foo", "Foo", "start_date:date", "parent:fk:Parent")
+
+        args, kwargs = m.call_args_list[0]
+        assert "indexes" not in args[3]
+        assert "select_related" not in args[5]
+        assert kwargs["test_perf_py"] is None
+
+    def test_schema(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        apps = [
+            {"package": "apps.foo", "model": "Foo", "fields": ["name:str"]},
+            {"package": "apps.bar", "model": "Bar", "fields": ["foo:fk:Foo"], "perf": True},
+        ]
+        (tmp_path / "schema.json").write_text(json.dumps({"apps": apps}))
+
+        out = StringIO()
+        call_command("scaffold", "--schema", "schema.json", stdout=out)
+        assert "19個のファイルを作成しました。(変更なし: 0個)" in out.getvalue()
+        assert "class Foo(CRUDLMixin, ActionMixin, models.Model)" in (tmp_path / "apps/foo/models.py").read_text()
+        assert "class TestBarQueryBudget(GenericTest)" in (tmp_path / "apps/bar/tests/test_perf.py").read_text()
+
+        # 内容が変わっていないファイルは書き込まない(YAMLでも指定できる)
+        (tmp_path / "schema.yaml").write_text("- package: apps.foo\n  model: Foo\n  fields: [name:str, note:text]\n")
+        out = StringIO()
+        call_command("scaffold", "--schema", "schema.yaml", stdout=out)
+        assert out.getvalue().splitlines() == [
+            "作成: apps/foo/models.py",
+            "1個のファイルを作成しました。(変更なし: 8個)",
+        ]
@@ -0,0 +1,64 @@
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.urls import include, path, set_script_prefix
+from django.utils import translation
+
+from apps.libs.templatetags import global_menu
+
+urlpatterns = [
+    path("admin/", include(([path("", lambda request: HttpResponse(), name="index")], "admin"))),
+]
+
+
+def render(user=None):
+    return Template("{% load global_menu %}{% global_menu %}").render(Context({"user": user}))
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(settings):
+    settings.GLOBAL_MENU_APPS = []
+    cache.clear()
+
+
+@pytest.mark.urls(__name__)
+@pytest.mark.django_db
+def test_global_menu():
+    alice = User.objects.create(username="alice")
+    bob = User.objects.create(username="bob")
+
+    with mock.patch.object(global_menu, "get_global_menu", wraps=global_menu.get_global_menu) as get_menu:
+        html = render(alice)
+        assert '<a href="/admin/">' in html
+
+        # ユーザーによらず、キャッシュを使う
+        assert render(alice) == html
+        assert render(bob) == html
+        assert render(AnonymousUser()) == html
+        assert get_menu.call_count == 1
+
+        # 言語が違えば描画し直す
+        with translation.override("en"):
+            render(alice)
+        assert get_menu.call_count == 2
+
+        # キャッシュを破棄すると描画し直す
+        global_menu.clear_global_menu_cache()
+        render(alice)
+        assert get_menu.call_count == 3
+
+
+@pytest.mark.urls(__name__)
+def test_global_menu_script_prefix():
+    assert '<a href="/admin/">' in render()
+
+    # スクリプトのプレフィックスが違えばURLも変わる
+    set_script_prefix("/prefix/")
+    try:
+        assert '<a href="/prefix/admin/">' in render()
+    finally:
+        set_script_prefix("/")
@@ -0,0 +1,56 @@
+from datetime import date
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils.safestring import mark_safe
+from social_django.models import UserSocialAuth
+
+from apps.libs.templatetags.jahumanize import natural_text_column, urlize_with_target_blank, with_weekday
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    (
+        ("abc", "abc"),
+        ("<b>&'", "&lt;b&gt;&amp;&#x27;"),
+        (mark_safe("<b>abc</b>"), "<b>abc</b>"),
+        ("https://example.com", '<a target="_blank" href="https://example.com" rel="nofollow">https://example.com</a>'),
+        ("x@example.com", '<a target="_blank" href="mailto:x@example.com">x@example.com</a>'),
+    ),
+)
+def test_urlize_with_target_blank(value, expected):
+    assert urlize_with_target_blank(value) == expected
+
+
+def test_natural_text_column():
+    class Item:
+        def __init__(self, name):
+            self.name = name
+
+    assert natural_text_column([Item("abc"), Item(""), Item(None)], "name") == ["abc", "(なし)", "(なし)"]
+
+
+def test_with_weekday():
+    dates = (date(2021, 6, 10), date(2021, 6, 13))
+
+    assert with_weekday(dates) == [(date(2021, 6, 10), "木"), (date(2021, 6, 13), "日")]
+    assert with_weekday(dates, "wide")[0][1] == "木曜日"
+
+
+@pytest.mark.django_db
+def test_natural_text_column_foreign_key(django_assert_num_queries):
+    users = [User.objects.create(username=username) for username in ("a", "b")]
+    for user, provider in ((users[0], "auth0"), (users[1], "auth0"), (users[0], "b")):
+        UserSocialAuth.objects.create(user=user, provider=provider, uid=user.username)
+
+    # 参照先は1回のクエリでまとめて取得する(行ごとにクエリを発行しない)
+    with django_assert_num_queries(2):
+        assert natural_text_column(UserSocialAuth.objects.order_by("pk"), "user") == ["a", "b", "a"]
+
+    # select_related済みの場合は追加のクエリを発行しない
+    with django_assert_num_queries(1):
+        assert natural_text_column(UserSocialAuth.objects.select_related("user").order_by("pk"), "user") == [
+            "a",
+            "b",
+            "a",
+        ]
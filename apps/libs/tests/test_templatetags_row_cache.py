@@ -0,0 +1,72 @@
+from datetime import datetime
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.template import Context, Template
+
+from apps.libs.row_cache import RowFragmentCache, row_cache_stats
+
+TEMPLATE = "{% load row_cache %}{% for object in object_list %}{% row_cache object %}[{{ object.username }}]{% endrow_cache %}{% endfor %}"
+
+
+def render(object_list, row_cache=None):
+    context = {"object_list": object_list}
+    if row_cache:
+        context["row_cache"] = row_cache
+
+    return Template(TEMPLATE).render(Context(context))
+
+
+def test_row_cache():
+    cache.clear()
+    row_cache_stats.reset()
+    users = [User(pk=1, username="a", last_login=datetime(2021, 1, 1)), User(pk=2, username="b", last_login=None)]
+
+    # キャッシュなし
+    assert render(users) == "[a][b]"
+
+    # 1回目は描画して保存する(バージョンがない行はキャッシュしない)
+    row_cache = RowFragmentCache("last_login")
+    row_cache.prefetch(users)
+    assert render(users, row_cache) == "[a][b]"
+    row_cache.flush()
+    assert (row_cache_stats.hits, row_cache_stats.misses) == (0, 1)
+
+    # 2回目はキャッシュを使う
+    users[0].username = "changed"
+    row_cache = RowFragmentCache("last_login")
+    row_cache.prefetch(users)
+    assert render(users, row_cache) == "[a][b]"
+    assert (row_cache_stats.hits, row_cache_stats.misses) == (1, 1)
+
+    # 更新されると別のキーになる
+    users[0].last_login = datetime(2021, 1, 2)
+    row_cache = RowFragmentCache("last_login")
+    row_cache.prefetch(users)
+    assert render(users, row_cache) == "[changed][b]"
+
+
+def test_row_cache_skips_post_forms():
+    cache.clear()
+    user = User(pk=1, username="a", last_login=datetime(2021, 1, 1))
+
+    # POSTのフォームやCSRFのトークンを含む行は保存しない
+    row_cache = RowFragmentCache("last_login")
+    row_cache.set(user, '<form method="post" action="/delete/">...</form>')
+    row_cache.set(user, '<input type="hidden" name="csrfmiddlewaretoken" value="x">')
+    assert not row_cache.pending
+
+    row_cache.set(user, '<form method="get">...</form>')
+    assert row_cache.pending
+
+
+def test_row_cache_default_timeout():
+    # timeoutを省略した場合は、キャッシュの既定の有効期限を使う
+    row_cache = RowFragmentCache("last_login")
+    user = User(pk=1, username="a", last_login=datetime(2021, 1, 1))
+    row_cache.set(user, "[a]")
+    with mock.patch.object(row_cache.cache, "set_many") as set_many:
+        row_cache.flush()
+    set_many.assert_called_once_with({row_cache.make_key(user): "[a]"}, timeout=DEFAULT_TIMEOUT)
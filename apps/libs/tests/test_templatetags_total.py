@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+
+import pytest
+from django.contrib.auth.models import User
+
+from apps.libs.templatetags.total import total
+
+
+@dataclass
+class Item:
+    price: int
+
+    def double(self):
+        return self.price * 2
+
+
+@pytest.mark.parametrize(
+    "key, expected",
+    (
+        ("price", 6),
+        ("double", 12),
+    ),
+)
+def test_total(key, expected):
+    object_list = [Item(price=1), Item(price=2), Item(price=3)]
+    assert total(object_list, key) == expected
+
+
+def test_total_empty():
+    assert total([], "price") == 0
+
+
+@pytest.mark.django_db
+def test_total_queryset(django_assert_num_queries):
+    users = [User.objects.create(username=username) for username in ("a", "b", "c")]
+    expected = sum(user.pk for user in users)
+
+    # 未評価のQuerySetはDBで集計する
+    with django_assert_num_queries(1) as context:
+        assert total(User.objects.all(), "id") == expected
+    assert "SUM" in context.captured_queries[0]["sql"]
+
+    # 評価済みの場合はキャッシュを使う
+    qs = User.objects.all()
+    list(qs)
+    with django_assert_num_queries(0):
+        assert total(qs, "id") == expected
+
+    # Sum() はNoneを返すが、0にする
+    assert total(User.objects.none(), "id") == 0
+    assert total(User.objects.filter(username="x"), "id") == 0
@@ -0,0 +1,26 @@
+import pytest
+
+from apps.libs.templatetags.url import concat_next_url, inherit_next_url
+
+
+@pytest.mark.parametrize(
+    "url, next_url, expected",
+    (
+        ("/add/", "/list/", "/add/?next=/list/"),
+        ("/add/?status=1", "/list/?page=2", "/add/?status=1&next=/list/%3Fpage%3D2"),
+    ),
+)
+def test_concat_next_url(url, next_url, expected):
+    assert concat_next_url(url, next_url) == expected
+
+
+@pytest.mark.parametrize(
+    "url, current_url, expected",
+    (
+        ("/edit/", "/detail/", "/edit/"),
+        ("/edit/", "/detail/?next=/list/", "/edit/?next=/list/"),
+        ("/edit/", "/detail/?next=/list/%3Fnext%3D/top/", "/edit/?next=/top/"),
+    ),
+)
+def test_inherit_next_url(url, current_url, expected):
+    assert inherit_next_url(url, current_url) == expected
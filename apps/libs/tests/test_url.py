@@ -1,6 +1,10 @@
 import pytest
+from django.http import HttpResponse
+from django.urls import path
 
-from apps.libs.url import remove_next_url, remove_query_string
+from apps.libs.url import is_resolvable_url, parse_next_chain, remove_next_url, remove_query_string
+
+urlpatterns = [path("path/to/", lambda request: HttpResponse(), name="path_to")]
 
 
 class TestRemoveNextUrl:
@@ -33,3 +37,36 @@ class TestRemoveQueryString:
     )
     def test_it(self, url, expected):
         assert remove_query_string(url) == expected
+
+
+class TestParseNextChain:
+    @pytest.mark.parametrize(
+        "url, expected",
+        (
+            ("/path/only", ()),
+            ("/path/to/?status=1", ()),
+            ("/path/to/?next=/next/url", ("/next/url",)),
+            ("/path/to/?next=/next/url%3Fnext%3D/next/next/url", ("/next/url?next=/next/next/url", "/next/next/url")),
+            ("", ()),
+            (None, ()),
+        ),
+    )
+    def test_it(self, url, expected):
+        assert parse_next_chain(url) == expected
+
+
+@pytest.mark.urls(__name__)
+class TestIsResolvableUrl:
+    @pytest.mark.parametrize(
+        "url, expected",
+        (
+            ("/path/to/", True),
+            ("/path/to/?next=/next/url", True),
+            ("/path/only", False),
+            ("https://example.com/path/to/", False),
+            ("", False),
+            (None, False),
+        ),
+    )
+    def test_it(self, url, expected):
+        assert is_resolvable_url(url) == expected
@@ -1,8 +1,8 @@
-from datetime import datetime
+from datetime import date, datetime, timezone
 
 import pytest
 
-from apps.libs.tests.utils import freeze_time, prepare_inputs
+from apps.libs.tests.utils import _normalize_for_display, _normalize_many_for_display, freeze_time, prepare_inputs
 
 
 def test_prepare_inputs():
@@ -27,6 +27,11 @@ def test_prepare_inputs():
         e=["x", "x"],
     )
 
+    # 元のdict・listは書き換えない
+    assert data["c"] is f
+    assert data["e"] == [f, f]
+    assert prepared_data["d"] is not data["d"]
+
 
 @pytest.mark.parametrize(
     "dt",
@@ -41,3 +46,11 @@ def test_freeze_time(dt):
     with freeze_time(dt):
         now = datetime.now()
         assert now == datetime(2021, 6, 10, 0, 0, 0)
+
+
+def test_normalize_many_for_display():
+    values = [datetime(2021, 6, 9, 15, tzinfo=timezone.utc), date(2021, 6, 10), True, None, 1]
+
+    # datetimeは現在のタイムゾーン(日本時間)で表示する
+    assert _normalize_many_for_display(values) == ["2021年6月10日0:00", "2021年6月10日", "はい", "(なし)", "1"]
+    assert _normalize_for_display(values[0]) == "2021年6月10日0:00"
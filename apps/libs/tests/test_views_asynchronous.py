@@ -0,0 +1,94 @@
+from datetime import datetime, timezone
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.template import engines
+from django.template.response import TemplateResponse
+from django.test import AsyncRequestFactory
+from social_django.models import UserSocialAuth
+
+from apps.libs.views import AsyncGenericDetailView, AsyncGenericListView
+
+
+class UserListView(AsyncGenericListView):
+    model = User
+    ordering = ("pk",)
+    paginate_by = 2
+
+    def render_to_response(self, context, **response_kwargs):
+        usernames = ",".join(user.username for user in context["object_list"])
+        return HttpResponse(f"{usernames}/{context['paginator'].count}")
+
+
+class UserDetailView(AsyncGenericDetailView):
+    model = User
+
+    def render_to_response(self, context, **response_kwargs):
+        return HttpResponse(context["object"].username)
+
+
+class UserRowCacheListView(AsyncGenericListView):
+    model = User
+    ordering = ("pk",)
+    row_cache_version_field = "last_login"
+    row_cache_vary_on_permissions = True
+    last_modified_field = "last_login"
+    json_fields = ("username",)
+
+    def render_to_response(self, context, **response_kwargs):
+        template = engines["django"].from_string(
+            "{% load row_cache %}{% for object in object_list %}"
+            "{% row_cache object %}[{{ object.username }}]{% endrow_cache %}"
+            "{% endfor %}"
+        )
+        return TemplateResponse(self.request, template, context)
+
+
+def call(view_class, user, path="/users/", headers=None, **kwargs):
+    async def auser():
+        return user
+
+    request = AsyncRequestFactory().get(path, headers=headers)
+    request.auser = auser
+    return async_to_sync(view_class.as_view())(request, **kwargs)
+
+
+@pytest.mark.django_db
+def test_async_views():
+    user = User.objects.create(username="a")
+    UserSocialAuth.objects.create(user=user, provider="auth0", uid="a")
+    User.objects.create(username="b")
+    User.objects.create(username="c")
+
+    assert call(UserListView, user).content == b"a,b/3"
+    assert call(UserListView, user, "/users/?page=last").content == b"c/3"
+    assert call(UserDetailView, user, pk=user.pk).content == b"a"
+
+    # Auth0でログインしていない場合
+    assert call(UserListView, AnonymousUser()).status_code == 302
+    with pytest.raises(PermissionDenied):
+        call(UserListView, User.objects.get(username="b"))
+
+
+@pytest.mark.django_db
+def test_async_list_view_shortcuts():
+    cache.clear()
+    user = User.objects.create(username="a", last_login=datetime(2021, 1, 1, tzinfo=timezone.utc))
+    UserSocialAuth.objects.create(user=user, provider="auth0", uid="a")
+
+    # 行のキャッシュ(ユーザーの権限の取得)は、イベントループの外で行う
+    response = call(UserRowCacheListView, user)
+    assert response.render().content == b"[a]"
+    assert response.headers["Vary"] == "Accept"
+
+    # 変更がなければ304を返す
+    response = call(UserRowCacheListView, user, headers={"If-None-Match": response.headers["ETag"]})
+    assert response.status_code == 304
+
+    # JSONも同期のViewと同じく返す
+    response = call(UserRowCacheListView, user, "/users/?format=json")
+    assert b"".join(response.streaming_content) == b'[{"username":"a"}]'
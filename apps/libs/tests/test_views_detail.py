@@ -0,0 +1,74 @@
+import json
+
+import pytest
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory
+from social_django.models import UserSocialAuth
+
+from apps.libs.views import GenericDetailView, GenericRelatedPageView
+
+
+class UserDetailView(GenericDetailView):
+    model = User
+    related_page_size = 2
+
+    def render_to_response(self, context, **response_kwargs):
+        providers = [social_auth.provider for social_auth in context["object_list"]]
+        counts = context["related_counts"]["social_auth"]
+        return HttpResponse(f"{providers}/{counts}/{context.get('related_next_after')}")
+
+
+class UserConditionalDetailView(UserDetailView):
+    last_modified_field = "last_login"
+
+    def render_to_response(self, context, **response_kwargs):
+        return HttpResponse(f"{context['related_counts']['social_auth']}")
+
+
+class UserRelatedPageView(GenericRelatedPageView):
+    model = User
+    page_size = 2
+
+
+def call(view_class, user, params=None, headers=None, **kwargs):
+    request = RequestFactory().get("/", params, headers=headers)
+    request.user = user
+    return view_class.as_view()(request, pk=user.pk, **kwargs)
+
+
+@pytest.mark.django_db
+def test_related_page():
+    user = User.objects.create(username="a")
+    social_auths = [UserSocialAuth.objects.create(user=user, provider=p, uid="a") for p in ("auth0", "b", "c")]
+
+    # 詳細画面は最初のページと件数のみ
+    response = call(UserDetailView, user, {"perspective": "social_auth"})
+    assert response.content.decode() == f"['auth0', 'b']/3/{social_auths[1].pk}"
+
+    # 続きを取得
+    response = call(UserRelatedPageView, user, {"after": social_auths[1].pk}, key="social_auth")
+    data = json.loads(response.content)
+    assert [row["provider"] for row in data["object_list"]] == ["c"]
+    assert data["next_after"] is None
+
+    assert call(UserRelatedPageView, user, {"after": "x"}, key="social_auth").status_code == 400
+
+
+@pytest.mark.django_db
+def test_conditional_get_related_counts(django_assert_num_queries):
+    user = User.objects.create(username="a")
+    UserSocialAuth.objects.create(user=user, provider="auth0", uid="a")
+
+    response = call(UserConditionalDetailView, user)
+    assert response.content == b"1"
+    etag = response.headers["ETag"]
+    with django_assert_num_queries(3, info="ログインの確認、行の集計、逆参照の件数"):
+        assert call(UserConditionalDetailView, user, headers={"if-none-match": etag}).status_code == 304
+
+    # 関連するレコードが追加されたら、304にしない
+    UserSocialAuth.objects.create(user=user, provider="b", uid="a")
+    response = call(UserConditionalDetailView, user, headers={"if-none-match": etag})
+    assert response.status_code == 200
+    assert response.content == b"2"
+    assert response.headers["ETag"] != etag
@@ -0,0 +1,321 @@
+import json
+from datetime import datetime, timezone
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import AnonymousUser, Group, User
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from django.template import engines
+from django.template.response import TemplateResponse
+from django.test import RequestFactory
+from django.urls import path
+from django.utils import translation
+from django.views.generic import CreateView, DetailView, ListView
+
+from apps.libs import views_mixin
+from apps.libs.tests.utils import assert_no_deferred_loads
+from apps.libs.views_mixin import (
+    AutoModelFormMixin,
+    ConditionalGetMixin,
+    DisplayAsTableMixin,
+    JsonResponseMixin,
+    RowCacheMixin,
+    SingleObjectJsonResponseMixin,
+    SupportSuccessUrlMixin,
+)
+
+
+class UserListView(ConditionalGetMixin, ListView):
+    model = User
+    last_modified_field = "last_login"
+
+    def render_to_response(self, context, **response_kwargs):
+        return HttpResponse(",".join(user.username for user in context["object_list"]))
+
+
+def get(**headers):
+    request = RequestFactory().get("/users/", headers=headers)
+    request.user = AnonymousUser()
+    return UserListView.as_view()(request)
+
+
+@pytest.mark.django_db
+def test_conditional_get():
+    User.objects.create(username="a", last_login=datetime(2021, 1, 1, tzinfo=timezone.utc))
+
+    response = get()
+    assert response.status_code == 200
+    assert response.content == b"a"
+    assert response.headers["Last-Modified"] == "Fri, 01 Jan 2021 00:00:00 GMT"
+    etag = response.headers["ETag"]
+
+    # 変更がなければ304
+    assert get(if_none_match=etag).status_code == 304
+    assert get(if_modified_since=response.headers["Last-Modified"]).status_code == 304
+
+    # 件数が変わった場合
+    User.objects.create(username="b")
+    response = get(if_none_match=etag)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+class UserJsonListView(JsonResponseMixin, ListView):
+    model = User
+    json_fields = ("username", "is_staff")
+
+    def render_to_response(self, context, **response_kwargs):
+        return HttpResponse("html")
+
+
+class UserJsonDetailView(SingleObjectJsonResponseMixin, DetailView):
+    model = User
+    json_fields = ("username", "is_staff")
+
+
+@pytest.mark.django_db
+def test_json_response():
+    user = User.objects.create(username="a")
+    User.objects.create(username="b", is_staff=True)
+    factory = RequestFactory()
+
+    response = UserJsonListView.as_view()(factory.get("/users/"))
+    assert response.content == b"html"
+    assert response.headers["Vary"] == "Accept"
+
+    response = UserJsonListView.as_view()(factory.get("/users/", headers={"accept": "application/json"}))
+    assert response.headers["Content-Type"] == "application/json"
+    assert b"".join(response.streaming_content) == (
+        b'[{"username":"a","is_staff":false},{"username":"b","is_staff":true}]'
+    )
+
+    response = UserJsonDetailView.as_view()(factory.get("/users/", {"format": "json"}), pk=user.pk)
+    assert response.content == b'{"username":"a","is_staff":false}'
+
+
+class UserRelatedJsonDetailView(SingleObjectJsonResponseMixin, DetailView):
+    model = User
+    json_fields = ("username", "groups", "groups__name", "date_joined__year")
+
+
+@pytest.mark.django_db
+def test_json_response_related_fields():
+    user = User.objects.create(username="a", date_joined=datetime(2021, 1, 1, tzinfo=timezone.utc))
+    groups = [Group.objects.create(name=name) for name in ("x", "y")]
+    factory = RequestFactory()
+
+    def get_json(pk):
+        response = UserRelatedJsonDetailView.as_view()(factory.get("/users/", {"format": "json"}), pk=pk)
+        return json.loads(response.content)
+
+    # 一覧と同じく `__` でたどった列も取得でき、多対多はリストになる
+    assert get_json(user.pk) == {"username": "a", "groups": [], "groups__name": [], "date_joined__year": 2021}
+
+    user.groups.set(groups)
+    data = get_json(user.pk)
+    assert sorted(data["groups"]) == [group.pk for group in groups]
+    assert sorted(data["groups__name"]) == ["x", "y"]
+
+    with pytest.raises(Http404):
+        get_json(user.pk + 1)
+
+
+class UserNoJsonListView(UserJsonListView):
+    json_fields = None
+
+
+class UserLimitedJsonListView(UserJsonListView):
+    json_fields = ("username",)
+    ordering = "pk"
+    json_max_rows = 1
+
+
+class UserPagedJsonListView(UserJsonListView):
+    json_fields = ("username",)
+    ordering = "pk"
+    paginate_by = 1
+
+
+@pytest.mark.django_db
+def test_json_response_limits():
+    User.objects.create(username="a")
+    User.objects.create(username="b")
+    factory = RequestFactory()
+
+    def get_json(view_class, params=None):
+        request = factory.get("/users/", params, headers={"accept": "application/json"})
+        return view_class.as_view()(request)
+
+    # json_fieldsを指定していない場合はJSONを返さない
+    response = get_json(UserNoJsonListView)
+    assert response.content == b"html"
+    assert "Vary" not in response.headers
+
+    # ページングしていない場合は最大 json_max_rows 件
+    assert b"".join(get_json(UserLimitedJsonListView).streaming_content) == b'[{"username":"a"}]'
+
+    # ページングしている場合はHTMLと同じページ
+    response = get_json(UserPagedJsonListView, {"page": 2})
+    assert b"".join(response.streaming_content) == b'[{"username":"b"}]'
+
+
+class UserTableView(DisplayAsTableMixin, ListView):
+    model = User
+    list_columns = (("ユーザー名", "username"), ("スタッフ", "is_staff"), ("フルネーム", "get_full_name"))
+    list_extra_fields = ("first_name", "last_name")
+
+
+@pytest.mark.django_db
+def test_display_as_table():
+    User.objects.create(username="a", first_name="b", last_name="c", email="x@example.com")
+    view = UserTableView()
+    view.setup(RequestFactory().get("/users/"))
+
+    assert view.headers() == ["ユーザー名", "スタッフ", "フルネーム"]
+    with assert_no_deferred_loads():
+        assert [view.columns(user) for user in view.get_queryset()] == [["a", False, "b c"]]
+
+        # 取得していないフィールドを読み込んだ場合
+        with pytest.raises(AssertionError):
+            _ = view.get_queryset().get().email
+
+        # 明示的な refresh_from_db() はそのまま実行する
+        user = User.objects.get()
+        User.objects.update(username="changed")
+        user.refresh_from_db()
+        assert user.username == "changed"
+
+
+class StringTemplateListView(ListView):
+    template_string = None
+
+    def render_to_response(self, context, **response_kwargs):
+        return TemplateResponse(self.request, engines["django"].from_string(self.template_string), context)
+
+
+class UserRowCacheView(RowCacheMixin, StringTemplateListView):
+    model = User
+    ordering = "pk"
+    row_cache_version_field = "last_login"
+    template_string = (
+        "{% load row_cache %}{% for object in object_list %}"
+        "{% row_cache object %}[{{ object.username }}:{{ view.request.user.username }}]{% endrow_cache %}"
+        "{% endfor %}"
+    )
+
+
+@pytest.mark.django_db
+def test_row_cache_per_user():
+    cache.clear()
+    alice = User.objects.create(username="alice", last_login=datetime(2021, 1, 1, tzinfo=timezone.utc))
+    bob = User.objects.create(username="bob", last_login=datetime(2021, 1, 1, tzinfo=timezone.utc))
+
+    def get_as(user):
+        request = RequestFactory().get("/users/")
+        request.user = user
+        return UserRowCacheView.as_view()(request).render().content
+
+    assert get_as(alice) == b"[alice:alice][bob:alice]"
+    # 他のユーザーが描画した行は使わない
+    assert get_as(bob) == b"[alice:bob][bob:bob]"
+
+    # 言語が違えば別のキーになる
+    request = RequestFactory().get("/users/")
+    request.user = alice
+    view = UserRowCacheView(request=request)
+    with translation.override("en"):
+        variant = view.get_row_cache_variant()
+    with translation.override("ja"):
+        assert view.get_row_cache_variant() != variant
+
+
+@pytest.mark.django_db
+def test_row_cache_vary_on_permissions(django_assert_num_queries):
+    user = User.objects.create(username="alice")
+    request = RequestFactory().get("/users/")
+    request.user = user
+    view = UserRowCacheView(request=request)
+
+    # 既定では権限を取得しない
+    with django_assert_num_queries(0):
+        variant = view.get_row_cache_variant()
+
+    # 指定した場合は、権限が変われば別のキーになる
+    view.row_cache_vary_on_permissions = True
+    variant = view.get_row_cache_variant()
+    user.is_superuser = True
+    user.save()
+    request.user = User.objects.get(pk=user.pk)
+    assert view.get_row_cache_variant() != variant
+
+
+class UserCreateView(AutoModelFormMixin, CreateView):
+    model = User
+
+
+class UserCreateSubView(UserCreateView):
+    pass
+
+
+class UserCreateFieldsView(UserCreateView):
+    fields = ("username",)
+
+
+def test_auto_model_form(monkeypatch):
+    AutoModelFormMixin.clear_auto_form_classes()
+    get_model_fields = mock.Mock(wraps=views_mixin.get_model_fields)
+    monkeypatch.setattr(views_mixin, "get_model_fields", get_model_fields)
+
+    # 2回目以降はキャッシュしたフォームクラスを使う
+    form_class = UserCreateView().get_form_class()
+    assert UserCreateView().get_form_class() is form_class
+    assert "username" in form_class.base_fields
+    assert get_model_fields.call_count == 1
+
+    # サブクラスは別に作成する
+    sub_form_class = UserCreateSubView().get_form_class()
+    assert sub_form_class is not form_class
+    assert get_model_fields.call_count == 2
+
+    # fields, form_classがある場合はキャッシュを使わない
+    assert list(UserCreateFieldsView().get_form_class().base_fields) == ["username"]
+    view = UserCreateView()
+    view.fields = ("email",)
+    assert list(view.get_form_class().base_fields) == ["email"]
+    assert get_model_fields.call_count == 2
+
+    # キャッシュを破棄すると作り直す
+    AutoModelFormMixin.clear_auto_form_classes()
+    assert UserCreateView().get_form_class() is not form_class
+    assert get_model_fields.call_count == 3
+
+
+urlpatterns = [
+    path("users/", lambda request: HttpResponse(), name="users"),
+]
+
+
+class UserSupportSuccessUrlCreateView(SupportSuccessUrlMixin, CreateView):
+    model = User
+    fields = ("username",)
+    success_url = "/default/"
+
+
+@pytest.mark.urls(__name__)
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "success_url, expected",
+    (
+        ("/users/?page=2", "/users/?page=2"),
+        # 解決できない場合は、Viewのsuccess_url
+        ("/unknown/", "/default/"),
+        ("", "/default/"),
+    ),
+)
+def test_support_success_url(success_url, expected):
+    request = RequestFactory().post("/users/add/", {"username": f"user{len(success_url)}", "success_url": success_url})
+    response = UserSupportSuccessUrlCreateView.as_view()(request)
+
+    assert response.status_code == 302
+    assert response.url == expected
@@ -1,6 +1,7 @@
-import copy
+from contextlib import contextmanager
 from datetime import date, datetime
-from typing import Dict, Type
+from typing import Dict, Type, Union
+from unittest import mock
 
 import time_machine
 from bs4.element import Tag
@@ -14,8 +15,9 @@ from django.utils.timezone import make_aware
 from django_webtest import DjangoWebtestResponse
 from webtest import Field, Form, Hidden, Submit, Text, Upload
 
-from apps.libs.datetime import JAPAN_STANDARD_TIME
+from apps.libs.datetime import JAPAN_STANDARD_TIME, localize_many
 from apps.libs.factory import UploadFile
+from apps.libs.tests.html import LxmlElement, select, select_one
 from apps.libs.url import remove_next_url
 
 
@@ -45,7 +47,7 @@ class ObjectItem:
             return self.item.get_text().strip()
 
     def text(self):
-        item = self.item  # type: Tag
+        item = self.item  # type: Union[Tag, LxmlElement]
 
         # 画像の場合はそのsrcを返す
         if item.select_one("img"):
@@ -77,11 +79,11 @@ def add_dynamic_field(form: Form, name, value):
 
 
 def get_title(res: DjangoWebtestResponse) -> str:
-    return res.html.select_one("title").get_text()
+    return select_one(res, "title").get_text()
 
 
 def get_heading(res: DjangoWebtestResponse) -> str:
-    h2_list = res.html.select(".body h2")
+    h2_list = select(res, ".body h2")
     assert len(h2_list) == 1
     return h2_list[0].get_text()
 
@@ -118,21 +120,14 @@ def get_input_fields(form: Form) -> list:
 
 
 def prepare_inputs(input_dict: Dict) -> Dict:
-    # 一旦全体をコピー
-    input_dict_copy = copy.deepcopy(input_dict)
-
     # Factory などの callable がある場合はそれを呼んだ値に置き換え
-    for key, value in input_dict_copy.items():
+    # (値そのものは書き換えないため、コピーするのはdictとlistのみ)
+    input_dict_copy = {}
+    for key, value in input_dict.items():
         if isinstance(value, list):
-            new_values = []
-            for v in value:
-                if callable(v):
-                    new_values.append(v())
-                else:
-                    new_values.append(v)
-            input_dict_copy[key] = new_values
-        elif callable(value):
-            input_dict_copy[key] = value()
+            input_dict_copy[key] = [_prepare_input(v) for v in value]
+        else:
+            input_dict_copy[key] = _prepare_input(value)
 
     return input_dict_copy
 
@@ -190,9 +185,22 @@ def _normalize_value(obj1, obj2):
     return obj1, obj2
 
 
+def _normalize_many_for_display(objs) -> list:
+    """画面に表示される文字列にまとめて変換する(datetimeはまとめて現在のタイムゾーンの時刻にする)"""
+    objs = list(objs)
+    indexes = [index for index, obj in enumerate(objs) if isinstance(obj, datetime)]
+    for index, localized in zip(indexes, localize_many(objs[index] for index in indexes)):
+        objs[index] = localized
+
+    return [_format_for_display(obj) for obj in objs]
+
+
 def _normalize_for_display(obj):
+    return _normalize_many_for_display([obj])[0]
+
+
+def _format_for_display(obj):
     if isinstance(obj, datetime):
-        obj = timezone.localtime(obj)
         return obj.strftime("%Y年%-m月%-d日%-H:%M")
     elif isinstance(obj, date):
         return obj.strftime("%Y年%-m月%-d日")
@@ -223,6 +231,25 @@ def _get_last_record(model: Type[Model]):
     return model.objects.order_by("-id").first()
 
 
+@contextmanager
+def assert_no_deferred_loads():
+    """only()/defer()で取得しなかったフィールドを、描画中に読み込んでいないことを確認する
+
+    遅延フィールドの読み込みは refresh_from_db(fields=[...]) になるため、それだけを失敗させる。
+    (シグナルなどで明示的に呼ばれる refresh_from_db() は、そのまま実行する)
+    """
+    original = Model.refresh_from_db
+
+    def refresh_from_db(instance, *args, fields=None, **kwargs):
+        if fields:
+            raise AssertionError(f"{instance.__class__.__name__}の遅延フィールド{fields}を読み込んでいます。")
+
+        return original(instance, *args, fields=fields, **kwargs)
+
+    with mock.patch.object(Model, "refresh_from_db", autospec=True, side_effect=refresh_from_db):
+        yield
+
+
 def freeze_time(s):
     if isinstance(s, str):
         dt = parser.parse(s)
@@ -1,8 +1,15 @@
+from functools import lru_cache
+from typing import Optional, Tuple
 from urllib.parse import ParseResult, parse_qs, urlencode, urlparse
 
-from django.urls import path
+from django.conf import settings
+from django.urls import Resolver404, get_urlconf, path, resolve
 
+# URLの解析結果をキャッシュする件数
+URL_CACHE_SIZE = 1024
 
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
 def remove_next_url(url: str):
     if not url:
         return url
@@ -21,6 +28,7 @@ def remove_next_url(url: str):
     return new_parsed.geturl()
 
 
+@lru_cache(maxsize=URL_CACHE_SIZE)
 def remove_query_string(url: str):
     if not url:
         return url
@@ -32,11 +40,54 @@ def remove_query_string(url: str):
     return new_parsed.geturl()
 
 
-def create_crudl(list_view, detail_view, add_view, edit_view, delete_view):
-    return [
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def parse_next_chain(url: str) -> Tuple[str, ...]:
+    """クエリストリングに入れ子になった "next" を外側から順に返す
+
+    "/a/?next=/b/%3Fnext%3D/c/" => ("/b/?next=/c/", "/c/")
+    """
+    chain = []
+    while url:
+        next_values = parse_qs(urlparse(url).query).get("next")
+        if not next_values:
+            break
+
+        url = next_values[0]
+        chain.append(url)
+
+    return tuple(chain)
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def _is_resolvable_path(url_path: str, urlconf) -> bool:
+    try:
+        resolve(url_path, urlconf)
+        return True
+    except Resolver404:
+        return False
+
+
+def is_resolvable_url(url: Optional[str]) -> bool:
+    """URLのパスがURLconfで解決できるかどうか(クエリストリングは無視する)"""
+    if not url:
+        return False
+
+    return _is_resolvable_path(remove_query_string(url), get_urlconf() or settings.ROOT_URLCONF)
+
+
+def create_crudl(list_view, detail_view, add_view, edit_view, delete_view, related_page_view=None):
+    patterns = [
         path("", list_view.as_view(), name="list"),
         path("detail/<int:pk>/", detail_view.as_view(), name="detail"),
         path("add/", add_view.as_view(), name="add"),
         path("edit/<int:pk>/", edit_view.as_view(), name="edit"),
         path("delete/<int:pk>/", delete_view.as_view(), name="delete"),
     ]
+
+    # 詳細画面の関連一覧の続き(GenericRelatedPageView)
+    if related_page_view:
+        patterns.append(
+            path("detail/<int:pk>/related/<str:key>/", related_page_view.as_view(), name="related-page"),
+        )
+
+    return patterns
@@ -1,23 +1,67 @@
-from apps.libs.views.base import GenericRedirectView, GenericTemplateView, GenericView
-from apps.libs.views.dates import (
-    GenericLatestMonthRedirectView,
-    GenericLatestYearRedirectView,
-    GenericMonthArchiveView,
-    GenericYearArchiveView,
-)
-from apps.libs.views.detail import GenericDetailView
-from apps.libs.views.edit import (
-    GenericAddView,
-    GenericBulkFormView,
-    GenericDeleteListView,
-    GenericDeleteView,
-    GenericEditView,
-    GenericInlineFormsetView,
-    GenericSortView,
-    GenericStatusUpdateView,
-)
-from apps.libs.views.list import GenericChildListView, GenericListView
-from apps.libs.views.misc import GenericFilterView
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from apps.libs.views.asynchronous import (
+        AsyncGenericDetailView,
+        AsyncGenericLatestMonthRedirectView,
+        AsyncGenericLatestYearRedirectView,
+        AsyncGenericListView,
+        AsyncGenericMonthArchiveView,
+        AsyncGenericRedirectView,
+        AsyncGenericYearArchiveView,
+    )
+    from apps.libs.views.base import GenericRedirectView, GenericTemplateView, GenericView
+    from apps.libs.views.dates import (
+        GenericLatestMonthRedirectView,
+        GenericLatestYearRedirectView,
+        GenericMonthArchiveView,
+        GenericYearArchiveView,
+    )
+    from apps.libs.views.detail import GenericDetailView, GenericRelatedPageView
+    from apps.libs.views.edit import (
+        GenericAddView,
+        GenericBulkFormView,
+        GenericDeleteListView,
+        GenericDeleteView,
+        GenericEditView,
+        GenericInlineFormsetView,
+        GenericSortView,
+        GenericStatusUpdateView,
+    )
+    from apps.libs.views.list import GenericChildListView, GenericListView
+    from apps.libs.views.misc import GenericFilterView
+
+# 使われたViewのモジュールだけを読み込む(django_filtersやsocial_djangoなどを、必要になるまで読み込まない)
+_LAZY_IMPORTS = {
+    "AsyncGenericDetailView": "apps.libs.views.asynchronous",
+    "AsyncGenericLatestMonthRedirectView": "apps.libs.views.asynchronous",
+    "AsyncGenericLatestYearRedirectView": "apps.libs.views.asynchronous",
+    "AsyncGenericListView": "apps.libs.views.asynchronous",
+    "AsyncGenericMonthArchiveView": "apps.libs.views.asynchronous",
+    "AsyncGenericRedirectView": "apps.libs.views.asynchronous",
+    "AsyncGenericYearArchiveView": "apps.libs.views.asynchronous",
+    "GenericRedirectView": "apps.libs.views.base",
+    "GenericTemplateView": "apps.libs.views.base",
+    "GenericView": "apps.libs.views.base",
+    "GenericLatestMonthRedirectView": "apps.libs.views.dates",
+    "GenericLatestYearRedirectView": "apps.libs.views.dates",
+    "GenericMonthArchiveView": "apps.libs.views.dates",
+    "GenericYearArchiveView": "apps.libs.views.dates",
+    "GenericDetailView": "apps.libs.views.detail",
+    "GenericRelatedPageView": "apps.libs.views.detail",
+    "GenericAddView": "apps.libs.views.edit",
+    "GenericBulkFormView": "apps.libs.views.edit",
+    "GenericDeleteListView": "apps.libs.views.edit",
+    "GenericDeleteView": "apps.libs.views.edit",
+    "GenericEditView": "apps.libs.views.edit",
+    "GenericInlineFormsetView": "apps.libs.views.edit",
+    "GenericSortView": "apps.libs.views.edit",
+    "GenericStatusUpdateView": "apps.libs.views.edit",
+    "GenericChildListView": "apps.libs.views.list",
+    "GenericListView": "apps.libs.views.list",
+    "GenericFilterView": "apps.libs.views.misc",
+}
 
 __all__ = [
     # base
@@ -31,6 +75,7 @@ __all__ = [
     "GenericLatestYearRedirectView",
     # detail
     "GenericDetailView",
+    "GenericRelatedPageView",
     # edit
     "GenericAddView",
     "GenericBulkFormView",
@@ -45,4 +90,28 @@ __all__ = [
     "GenericChildListView",
     # misc
     "GenericFilterView",
+    # asynchronous
+    "AsyncGenericRedirectView",
+    "AsyncGenericListView",
+    "AsyncGenericDetailView",
+    "AsyncGenericMonthArchiveView",
+    "AsyncGenericYearArchiveView",
+    "AsyncGenericLatestMonthRedirectView",
+    "AsyncGenericLatestYearRedirectView",
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    # 2回目以降は __getattr__ を通らない
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    # サブモジュールの `list` が組み込み関数を隠すため、list() は使わない
+    return sorted({*globals(), *__all__})
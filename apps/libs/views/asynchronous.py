@@ -0,0 +1,256 @@
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from django.http import Http404, HttpResponseGone, HttpResponsePermanentRedirect, HttpResponseRedirect
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.translation import gettext as _
+
+from apps.libs.datetime import local_today
+from apps.libs.json import wants_json
+from apps.libs.views.base import GenericRedirectView
+from apps.libs.views.dates import (
+    GenericLatestMonthRedirectView,
+    GenericLatestYearRedirectView,
+    GenericMonthArchiveView,
+    GenericYearArchiveView,
+)
+from apps.libs.views.detail import GenericDetailView
+from apps.libs.views.list import GenericListView
+
+
+class AsyncResponseMixin:
+    """同期のViewと同じく、条件付きGET(ConditionalGetMixin)とJSON(JsonResponseMixin)に対応する非同期のget()
+
+    ETagの元になるクエリ、JSONの取得はスレッドで行い、HTMLは aget_html_response() で組み立てる。
+    """
+
+    async def aget_html_response(self, request, *args, **kwargs):
+        raise NotImplementedError("aget_html_response() を実装してください。")  # pragma: no cover
+
+    # noinspection PyUnresolvedReferences
+    async def get(self, request, *args, **kwargs):
+        headers = await sync_to_async(self.get_conditional_headers)(request)
+        if headers:
+            etag, timestamp = headers
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response:
+                return response
+
+        if self.json_fields and wants_json(request):
+            response = await sync_to_async(self.get_json_response)()
+        else:
+            response = await self.aget_html_response(request, *args, **kwargs)
+
+        if headers:
+            self.set_conditional_headers(response, *headers)
+        if self.json_fields:
+            patch_vary_headers(response, ("Accept",))
+
+        return response
+
+
+class AsyncMultipleObjectMixin(AsyncResponseMixin):
+    """ListViewの一覧を非同期のORMで取得するmixin(コンテキストの組み立てとテンプレートの描画は同期で行われる)"""
+
+    _async_page = None
+
+    # noinspection PyUnresolvedReferences
+    async def apaginate_queryset(self, queryset, page_size):
+        paginator = self.get_paginator(
+            queryset,
+            page_size,
+            orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        # 件数だけ先に非同期で取得しておく(Paginator.countはcached_property)
+        paginator.count = await queryset.acount()
+
+        page_kwarg = self.page_kwarg
+        page = self.kwargs.get(page_kwarg) or self.request.GET.get(page_kwarg) or 1
+        try:
+            page_number = int(page)
+        except ValueError:
+            if page == "last":
+                page_number = paginator.num_pages
+            else:
+                raise Http404(_("Page is not “last”, nor can it be converted to an int."))
+
+        try:
+            page = paginator.page(page_number)
+        except InvalidPage as e:
+            raise Http404(_("Invalid page (%(page_number)s): %(message)s") % {"page_number": page_number, "message": e})
+
+        page.object_list = [obj async for obj in page.object_list]
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def paginate_queryset(self, queryset, page_size):
+        # get_context_data() からは、非同期で取得済みのページを返す(JSONの場合は同期で取得する)
+        if self._async_page is None:
+            # noinspection PyUnresolvedReferences
+            return super().paginate_queryset(queryset, page_size)
+
+        return self._async_page
+
+    # noinspection PyUnresolvedReferences
+    def get_context_object_name(self, object_list):
+        # 取得済みのリストにはmodelがないため、Viewのmodelから決める
+        if self.context_object_name:
+            return self.context_object_name
+        elif self.model:
+            return f"{self.model._meta.model_name}_list"
+        else:
+            return None
+
+    # noinspection PyUnresolvedReferences,PyAttributeOutsideInit
+    async def aget_html_response(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        page_size = self.get_paginate_by(queryset)
+        if page_size:
+            self._async_page = await self.apaginate_queryset(queryset, page_size)
+            self.object_list = self._async_page[2]
+        else:
+            self.object_list = [obj async for obj in queryset]
+
+        if not self.get_allow_empty() and not self.object_list:
+            raise Http404(
+                _("Empty list and “%(class_name)s.allow_empty” is False.") % {"class_name": self.__class__.__name__}
+            )
+
+        # 行のキャッシュのキー(ユーザーの権限など)は同期のORMで取得するため、スレッドで組み立てる
+        context = await sync_to_async(self.get_context_data)()
+        return self.render_to_response(context)
+
+
+class AsyncGenericListView(AsyncMultipleObjectMixin, GenericListView):
+    pass
+
+
+class AsyncGenericDetailView(AsyncResponseMixin, GenericDetailView):
+    # noinspection PyUnresolvedReferences
+    async def aget_object(self, queryset=None):
+        """SingleObjectMixin.get_object() の非同期版"""
+        if queryset is None:
+            queryset = self.get_queryset()
+
+        pk = self.kwargs.get(self.pk_url_kwarg)
+        slug = self.kwargs.get(self.slug_url_kwarg)
+        if pk is not None:
+            queryset = queryset.filter(pk=pk)
+
+        if slug is not None and (pk is None or self.query_pk_and_slug):
+            queryset = queryset.filter(**{self.get_slug_field(): slug})
+
+        if pk is None and slug is None:
+            raise AttributeError(
+                f"Generic detail view {self.__class__.__name__} must be called with either an object pk or a slug "
+                "in the URLconf."
+            )  # pragma: no cover
+
+        try:
+            return await queryset.aget()
+        except queryset.model.DoesNotExist:
+            raise Http404(
+                _("No %(verbose_name)s found matching the query") % {"verbose_name": queryset.model._meta.verbose_name}
+            )
+
+    # noinspection PyAttributeOutsideInit
+    async def aget_html_response(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+
+        # パースペクティブの一覧などのクエリ(get_context_queries())は、スレッドで並行して実行する
+        context = await sync_to_async(self.get_context_data)(object=self.object)
+        return self.render_to_response(context)
+
+
+class AsyncRedirectMixin:
+    """RedirectViewの非同期版(リダイレクト先は aget_redirect_url() で決める)"""
+
+    # noinspection PyUnresolvedReferences
+    async def aget_redirect_url(self, *args, **kwargs):
+        return self.get_redirect_url(*args, **kwargs)
+
+    # noinspection PyUnresolvedReferences
+    async def get(self, request, *args, **kwargs):
+        url = await self.aget_redirect_url(*args, **kwargs)
+        if url:
+            if self.permanent:
+                return HttpResponsePermanentRedirect(url)
+            else:
+                return HttpResponseRedirect(url)
+        else:
+            return HttpResponseGone()  # pragma: no cover
+
+    # RedirectViewと同じく、すべてのメソッドをGETと同じように扱う
+    async def head(self, request, *args, **kwargs):
+        return await self.get(request, *args, **kwargs)
+
+    async def post(self, request, *args, **kwargs):
+        return await self.get(request, *args, **kwargs)
+
+    async def options(self, request, *args, **kwargs):
+        return await self.get(request, *args, **kwargs)
+
+    async def delete(self, request, *args, **kwargs):
+        return await self.get(request, *args, **kwargs)
+
+    async def put(self, request, *args, **kwargs):
+        return await self.get(request, *args, **kwargs)
+
+    async def patch(self, request, *args, **kwargs):
+        return await self.get(request, *args, **kwargs)
+
+
+class AsyncGenericRedirectView(AsyncRedirectMixin, GenericRedirectView):
+    pass
+
+
+class AsyncDateArchiveMixin(AsyncResponseMixin):
+    """日付ごとのアーカイブの非同期版
+
+    前後の月(年)の判定などDjangoの日付ベースのViewのクエリは同期のみのため、
+    get_dated_items() とコンテキストの組み立てはスレッドで実行し、一覧は非同期のORMで取得する。
+    """
+
+    # noinspection PyUnresolvedReferences,PyAttributeOutsideInit
+    async def aget_html_response(self, request, *args, **kwargs):
+        self.date_list, object_list, extra_context = await sync_to_async(self.get_dated_items)()
+        self.object_list = [obj async for obj in object_list]
+        context = await sync_to_async(self.get_context_data)(
+            object_list=self.object_list, date_list=self.date_list, **extra_context
+        )
+        return self.render_to_response(context)
+
+
+class AsyncGenericMonthArchiveView(AsyncDateArchiveMixin, GenericMonthArchiveView):
+    pass
+
+
+class AsyncGenericYearArchiveView(AsyncDateArchiveMixin, GenericYearArchiveView):
+    pass
+
+
+class AsyncGenericLatestMonthRedirectView(AsyncRedirectMixin, GenericLatestMonthRedirectView):
+    async def aget_redirect_url(self, *args, **kwargs):
+        """最新のレコード、あるいは今月に移動"""
+        latest = await self.model.objects.order_by("-date").afirst()
+        if latest:
+            year = latest.date.year
+            month = latest.date.month
+        else:
+            today = local_today()
+            year = today.year
+            month = today.month
+
+        return self.get_month_url(year, month)
+
+
+class AsyncGenericLatestYearRedirectView(AsyncRedirectMixin, GenericLatestYearRedirectView):
+    async def aget_redirect_url(self, *args, **kwargs):
+        """最新のレコード、あるいは今年に移動"""
+        latest = await self.model.objects.order_by("-date").afirst()
+        if latest:
+            year = latest.date.year
+        else:
+            today = local_today()
+            year = today.year
+
+        return self.get_year_url(year)
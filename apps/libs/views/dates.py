@@ -5,11 +5,17 @@ from apps.libs.auth.mixins import Auth0LoginRequiredMixin
 from apps.libs.datetime import local_today
 from apps.libs.menu import CRUDLMenu, NavbarMixin
 from apps.libs.perspective import ListViewPerspectiveMixin
-from apps.libs.views_mixin import ObjectNameMixin
+from apps.libs.views_mixin import ConditionalGetMixin, JsonResponseMixin, ObjectNameMixin
 
 
 class GenericMonthArchiveView(
-    ListViewPerspectiveMixin, ObjectNameMixin, Auth0LoginRequiredMixin, NavbarMixin, MonthArchiveView
+    ListViewPerspectiveMixin,
+    ObjectNameMixin,
+    ConditionalGetMixin,
+    JsonResponseMixin,
+    Auth0LoginRequiredMixin,
+    NavbarMixin,
+    MonthArchiveView,
 ):
     month_format = "%m"
     allow_empty = True
@@ -28,6 +34,10 @@ class GenericMonthArchiveView(
     def get_month_url(self, year, month):
         raise NotImplementedError("get_month_url(year, month) を再定義してください。")  # pragma: no cover
 
+    def get_json_queryset(self):
+        _, object_list, _ = self.get_dated_items()
+        return self.limit_json_queryset(object_list)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
@@ -52,7 +62,13 @@ class GenericMonthArchiveView(
 
 
 class GenericYearArchiveView(
-    ListViewPerspectiveMixin, ObjectNameMixin, Auth0LoginRequiredMixin, NavbarMixin, YearArchiveView
+    ListViewPerspectiveMixin,
+    ObjectNameMixin,
+    ConditionalGetMixin,
+    JsonResponseMixin,
+    Auth0LoginRequiredMixin,
+    NavbarMixin,
+    YearArchiveView,
 ):
     year_format = "%Y"
     allow_empty = True
@@ -72,6 +88,10 @@ class GenericYearArchiveView(
     def get_year_url(self, year):
         raise NotImplementedError("get_year_url(year) を再定義してください。")  # pragma: no cover
 
+    def get_json_queryset(self):
+        _, object_list, _ = self.get_dated_items()
+        return self.limit_json_queryset(object_list)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
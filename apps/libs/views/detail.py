@@ -1,16 +1,36 @@
-from typing import List, Union
+from typing import Callable, Dict, List, Optional, Union
 
-from django.db.models import ForeignKey, ManyToManyRel, ManyToOneRel
-from django.views.generic import DetailView
+from django.core.exceptions import ValidationError
+from django.db.models import ForeignKey, ManyToManyRel, ManyToOneRel, QuerySet
+from django.http import Http404, HttpResponse, HttpResponseBadRequest
+from django.urls import NoReverseMatch, reverse
+from django.views.generic import DetailView, View
+from django.views.generic.detail import SingleObjectMixin
 
 from apps.libs.auth.mixins import Auth0LoginRequiredMixin
+from apps.libs.concurrent import run_concurrently
+from apps.libs.db.introspection import get_model_descriptor
+from apps.libs.db.shortcuts import KeysetPage, qs_keyset_page, qs_reverse_counts
+from apps.libs.json import JSON_CONTENT_TYPE, dumps
 from apps.libs.menu import CRUDLMenu, NavbarMixin
 from apps.libs.perspective import DetailViewPerspectiveMixin, Perspective, RelatedPerspective
-from apps.libs.views_mixin import ObjectNameMixin
+from apps.libs.views_mixin import ConditionalGetMixin, ObjectNameMixin, SingleObjectJsonResponseMixin
 
+# 関連一覧(perspective)の1ページの件数
+RELATED_PAGE_SIZE = 50
 
-class GenericDetailView(DetailViewPerspectiveMixin, ObjectNameMixin, Auth0LoginRequiredMixin, NavbarMixin, DetailView):
+
+class GenericDetailView(
+    DetailViewPerspectiveMixin,
+    ObjectNameMixin,
+    ConditionalGetMixin,
+    SingleObjectJsonResponseMixin,
+    Auth0LoginRequiredMixin,
+    NavbarMixin,
+    DetailView,
+):
     template_name = "generic/generic_detail.html"
+    related_page_size = RELATED_PAGE_SIZE
 
     @staticmethod
     def default_navbar_links(menu: CRUDLMenu, extra_menu):
@@ -19,45 +39,143 @@ class GenericDetailView(DetailViewPerspectiveMixin, ObjectNameMixin, Auth0LoginR
     def get_perspectives(self) -> List[Perspective]:
         return self.get_detail_perspectives(self.model)
 
+    def get_conditional_queryset(self) -> Optional[QuerySet]:
+        # 関連一覧(perspective)の変更は検知できないため、モデルで定義していない場合は対象外
+        if self.get_perspective() and not hasattr(self.model, "get_conditional_validators"):
+            return None
+
+        pk = self.kwargs.get(self.pk_url_kwarg)
+        if pk is None:
+            return None
+
+        return self.get_queryset().filter(pk=pk)
+
+    def get_conditional_validators(self) -> Optional[dict]:
+        validators = super().get_conditional_validators()
+        if validators is None or self.get_perspective():
+            return validators
+
+        # 詳細画面には逆参照の件数も表示するため、関連するレコードの追加・削除もETagに反映させる
+        # (取得した件数は、コンテキストでもそのまま使う)
+        model = self.get_queryset().model
+        relations = get_model_descriptor(model).reverse_relations
+        if relations:
+            try:
+                self.related_counts = qs_reverse_counts(model(pk=self.kwargs[self.pk_url_kwarg]), relations)
+            except model.DoesNotExist:
+                # 404はget_object()に任せる
+                return validators
+
+            validators = {**validators, "related_counts": sorted(self.related_counts.items())}
+
+        return validators
+
     @staticmethod
     def get_extra_buttons():
         return ()
 
+    def get_context_queries(self) -> Dict[str, Callable]:
+        """互いに依存しないコンテキストの値を取得する関数(キーがコンテキストの名前になる)
+
+        これらは並行して実行されるため、不整合のバッジなど時間のかかるクエリは、ここに追加する。
+        """
+        queries = {"extra_buttons": self.get_extra_buttons}
+
+        # すべての逆参照の件数
+        relations = get_model_descriptor(self.object.__class__).reverse_relations
+        related_counts = getattr(self, "related_counts", None)
+        if related_counts is not None:
+            queries["related_counts"] = lambda: related_counts
+        elif relations:
+            queries["related_counts"] = lambda: qs_reverse_counts(self.object, relations)
+
+        # 関連一覧は最初のページのみ(続きは GenericRelatedPageView から取得する)
+        perspective = self.get_perspective()  # type: RelatedPerspective
+        if perspective:
+            related_manager = getattr(self.object, perspective.accessor)
+            queries["related_page"] = lambda: qs_keyset_page(related_manager.all(), size=self.related_page_size)
+
+        return queries
+
+    def get_related_page_url(self, perspective: RelatedPerspective) -> Optional[str]:
+        """関連一覧の続きを取得するURL(create_crudl()に related_page_view を指定していない場合はNone)"""
+        match = self.request.resolver_match
+        name = f"{match.namespace}:related-page" if match and match.namespace else "related-page"
+        try:
+            return reverse(name, args=[self.object.pk, perspective.key])
+        except NoReverseMatch:
+            return None
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        obj = self.get_object()
         # object_nameを追加(タイトルで使われる)
         # パースペクティブを最優先
         perspective = self.get_perspective()  # type: RelatedPerspective
         if perspective:
             context["object_list_name"] = perspective.object_name
-            context["object_list"] = getattr(obj, perspective.accessor).all()
             context["object_name"] = perspective.object_name
         else:
             context["object_name"] = self.get_object_name()
 
-        context["extra_buttons"] = self.get_extra_buttons()
+        context.update(run_concurrently(self.get_context_queries()))
+
+        related_page = context.pop("related_page", None)  # type: Optional[KeysetPage]
+        if related_page:
+            context["object_list"] = related_page.object_list
+            context["related_next_after"] = related_page.next_after
+            context["related_page_url"] = self.get_related_page_url(perspective)
+
         return context
 
     @staticmethod
     def get_detail_perspectives(cls) -> List[RelatedPerspective]:
         perspectives = []
 
-        fields = cls._meta.get_fields()
+        # 逆参照かつ親へのリンクを持たない(子モデルでない)場合
+        fields = get_model_descriptor(cls).reverse_relations
         for field in fields:  # type: Union[ManyToOneRel, ManyToManyRel]
-            # 逆参照かつ親へのリンクを持たない(子モデルでない)場合
-            if isinstance(field, (ManyToOneRel, ManyToManyRel)) and not field.parent_link:
-                remote_field = field.remote_field  # type: ForeignKey
-                remote_model = remote_field.model
-                perspective = RelatedPerspective(
-                    key=field.name,
-                    accessor=field.get_accessor_name(),
-                    object_name=f"{remote_model._meta.verbose_name}一覧",
-                )
-                perspectives.append(perspective)
-            else:  # pragma: no cover
-                # 逆参照以外は無視
-                pass
+            remote_field = field.remote_field  # type: ForeignKey
+            remote_model = remote_field.model
+            perspective = RelatedPerspective(
+                key=field.name,
+                accessor=field.get_accessor_name(),
+                object_name=f"{remote_model._meta.verbose_name}一覧",
+            )
+            perspectives.append(perspective)
 
         return perspectives
+
+
+class GenericRelatedPageView(Auth0LoginRequiredMixin, SingleObjectMixin, View):
+    """詳細画面の関連一覧(perspective)の続きをJSONで返すView
+
+    `?after=<pk>` より後ろを1ページ分返す。
+    """
+
+    page_size = RELATED_PAGE_SIZE
+
+    def get_perspectives(self) -> List[RelatedPerspective]:
+        return GenericDetailView.get_detail_perspectives(self.object.__class__)
+
+    # noinspection PyAttributeOutsideInit
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+
+        perspective = next((p for p in self.get_perspectives() if p.key == kwargs["key"]), None)
+        if not perspective:
+            raise Http404(f"関連一覧 `{kwargs['key']}` がありません。")
+
+        related_qs = getattr(self.object, perspective.accessor).all()
+
+        # 主キーの型(整数、UUID、文字列など)に合わせて変換する
+        try:
+            after = related_qs.model._meta.pk.to_python(request.GET["after"]) if request.GET.get("after") else None
+        except ValidationError:
+            return HttpResponseBadRequest("`after` が不正です。")
+
+        fields = ["pk"] + [field.name for field in get_model_descriptor(related_qs.model).display_fields]
+        page = qs_keyset_page(related_qs.values(*fields), after, self.page_size)
+
+        data = {"object_list": page.object_list, "next_after": page.next_after}
+        return HttpResponse(dumps(data), content_type=JSON_CONTENT_TYPE)
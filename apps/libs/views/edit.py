@@ -12,10 +12,9 @@ from django.views.generic import CreateView, DeleteView, FormView, ListView, Upd
 from django.views.generic.base import View
 
 from apps.libs.auth.mixins import Auth0LoginRequiredMixin
-from apps.libs.db.models import get_model_fields
 from apps.libs.menu import CRUDLMenu, NavbarMixin
 from apps.libs.views.multiple import MultipleFormView
-from apps.libs.views_mixin import ObjectNameMixin, SuccessUrlMixin, SupportSuccessUrlMixin
+from apps.libs.views_mixin import AutoModelFormMixin, ObjectNameMixin, SuccessUrlMixin, SupportSuccessUrlMixin
 
 
 class GenericFormView(Auth0LoginRequiredMixin, NavbarMixin, FormView):
@@ -82,7 +81,13 @@ class GenericBulkAddWithCommonFormView(
 
 
 class GenericAddView(
-    SupportSuccessUrlMixin, SuccessUrlMixin, ObjectNameMixin, Auth0LoginRequiredMixin, NavbarMixin, CreateView
+    SupportSuccessUrlMixin,
+    SuccessUrlMixin,
+    ObjectNameMixin,
+    AutoModelFormMixin,
+    Auth0LoginRequiredMixin,
+    NavbarMixin,
+    CreateView,
 ):
     template_name = "generic/generic_form.html"
 
@@ -103,15 +108,6 @@ class GenericAddView(
 
         return initial
 
-    def get_form_class(self):
-        # fields, form_classがある場合はそちらを優先
-        if self.fields or self.form_class:
-            return super().get_form_class()
-
-        # 両方ないときはモデルを元に決める
-        self.fields = get_model_fields(self.model)
-        return super().get_form_class()
-
     @staticmethod
     def get_extra_buttons():
         return ()
@@ -132,7 +128,13 @@ class GenericAddView(
 
 
 class GenericEditView(
-    SupportSuccessUrlMixin, SuccessUrlMixin, ObjectNameMixin, Auth0LoginRequiredMixin, NavbarMixin, UpdateView
+    SupportSuccessUrlMixin,
+    SuccessUrlMixin,
+    ObjectNameMixin,
+    AutoModelFormMixin,
+    Auth0LoginRequiredMixin,
+    NavbarMixin,
+    UpdateView,
 ):
     template_name = "generic/generic_form.html"
 
@@ -140,15 +142,6 @@ class GenericEditView(
     def default_navbar_links(menu: CRUDLMenu, extra_menu):
         return menu.edit_navbar_links(extra_menu)
 
-    def get_form_class(self):
-        # fields, form_classがある場合はそちらを優先
-        if self.fields or self.form_class:
-            return super().get_form_class()
-
-        # 両方ないときはモデルを元に決める
-        self.fields = get_model_fields(self.model)
-        return super().get_form_class()
-
     def get_extra_buttons(self):
         if hasattr(self.object, "get_edit_actions"):
             return self.object.get_edit_actions()
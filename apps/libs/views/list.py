@@ -9,10 +9,25 @@ from apps.libs.actions import LinkAction
 from apps.libs.auth.mixins import Auth0LoginRequiredMixin
 from apps.libs.menu import CRUDLMenu, NavbarMixin
 from apps.libs.perspective import ListViewPerspectiveMixin, Perspective
-from apps.libs.views_mixin import ObjectListNameMixin, ObjectNameMixin
-
-
-class GenericListView(ListViewPerspectiveMixin, ObjectListNameMixin, Auth0LoginRequiredMixin, NavbarMixin, ListView):
+from apps.libs.views_mixin import (
+    ConditionalGetMixin,
+    JsonResponseMixin,
+    ObjectListNameMixin,
+    ObjectNameMixin,
+    RowCacheMixin,
+)
+
+
+class GenericListView(
+    ListViewPerspectiveMixin,
+    ObjectListNameMixin,
+    ConditionalGetMixin,
+    JsonResponseMixin,
+    RowCacheMixin,
+    Auth0LoginRequiredMixin,
+    NavbarMixin,
+    ListView,
+):
     template_name = "generic/generic_list.html"
 
     def __init__(self):
@@ -36,7 +51,7 @@ class GenericListView(ListViewPerspectiveMixin, ObjectListNameMixin, Auth0LoginR
         return ()
 
 
-class GenericChildListView(ObjectNameMixin, Auth0LoginRequiredMixin, NavbarMixin, ListView):
+class GenericChildListView(ObjectNameMixin, RowCacheMixin, Auth0LoginRequiredMixin, NavbarMixin, ListView):
     template_name = "generic/generic_list.html"
     parent_model = None
     child_model = None
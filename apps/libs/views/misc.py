@@ -5,11 +5,20 @@ from django_filters.views import FilterView
 from apps.libs.auth.mixins import Auth0LoginRequiredMixin
 from apps.libs.menu import CRUDLMenu, NavbarMixin
 from apps.libs.views.multiple import MultipleFilterView
+from apps.libs.views_mixin import JsonResponseMixin
 
 
-class GenericFilterView(Auth0LoginRequiredMixin, NavbarMixin, FilterView):
+class GenericFilterView(JsonResponseMixin, Auth0LoginRequiredMixin, NavbarMixin, FilterView):
     template_name = "generic/generic_filter.html"
 
+    def get_json_queryset(self):
+        # BaseFilterView.get() と同じ条件で絞り込む
+        filterset = self.get_filterset(self.get_filterset_class())
+        if not filterset.is_bound or filterset.is_valid() or not self.get_strict():
+            return self.limit_json_queryset(filterset.qs)
+
+        return filterset.queryset.none()
+
     @staticmethod
     def default_navbar_links(menu: CRUDLMenu, extra_menu):
         return menu.filter_navbar_links(extra_menu)
@@ -1,10 +1,25 @@
-from django.core.exceptions import ImproperlyConfigured
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+from django.contrib.messages import get_messages
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
 from django.db import transaction
-from django.db.models import Sum
+from django.db.models import Count, Max, QuerySet, Sum
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from django.urls import Resolver404, resolve
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from django.utils.translation import get_language
+from more_itertools import unique_everseen
 
-from apps.libs.url import remove_query_string
+from apps.libs.db.models import get_model_fields
+from apps.libs.db.shortcuts import qs_only
+from apps.libs.json import JSON_CONTENT_TYPE, dumps, stream_json_list, wants_json
+from apps.libs.row_cache import RowFragmentCache
+from apps.libs.url import is_resolvable_url
 
 
 class ObjectNameMixin:
@@ -97,6 +112,254 @@ class MoveMixin(CopyMixin):
         return response
 
 
+class AutoModelFormMixin:
+    """fields, form_classが未定義のとき、モデルを元にフォームクラスを作るmixin
+
+    作成したフォームクラスは (Viewクラス, モデル) ごとにキャッシュし、リクエスト間・スレッド間で共有する。
+    fields, form_classを後から設定した場合はそちらが優先される。
+    モデルのフィールドを変更した場合(テストなど)は、clear_auto_form_classes() でキャッシュを破棄する。
+    """
+
+    _auto_form_classes: Dict[Tuple[Type, Type], Type] = {}
+    _auto_form_classes_lock = threading.Lock()
+
+    @classmethod
+    def clear_auto_form_classes(cls):
+        with cls._auto_form_classes_lock:
+            cls._auto_form_classes.clear()
+
+    # noinspection PyUnresolvedReferences
+    def get_form_class(self):
+        # fields, form_classがある場合はそちらを優先
+        if self.fields or self.form_class:
+            return super().get_form_class()
+
+        key = (self.__class__, self.model)
+        form_class = self._auto_form_classes.get(key)
+        if form_class:
+            return form_class
+
+        with self._auto_form_classes_lock:
+            # ロック待ちの間に他のスレッドが作成している場合はそれを使う
+            form_class = self._auto_form_classes.get(key)
+            if not form_class:
+                # 両方ないときはモデルを元に決める
+                self.fields = get_model_fields(self.model)
+                form_class = super().get_form_class()
+                self._auto_form_classes[key] = form_class
+
+        return form_class
+
+
+class RowCacheMixin:
+    """一覧の各行の描画結果をキャッシュするmixin
+
+    `row_cache_version_field`(例: "updated_at")を指定したときだけ有効になる。
+    テンプレートでは `{% row_cache object %}...{% endrow_cache %}` で行を囲む。
+    行の中身が権限によって変わる場合は、`row_cache_vary_on_permissions = True` にする。
+    """
+
+    row_cache_version_field = None
+    row_cache_timeout = DEFAULT_TIMEOUT
+    row_cache_vary_on_permissions = False
+
+    def get_row_cache_variant(self) -> str:
+        # 同じ行でも、perspective、クエリ文字列(next_urlなど)、ユーザー、言語が違えば別の描画結果になる
+        # noinspection PyUnresolvedReferences
+        perspective = self.get_perspective() if hasattr(self, "get_perspective") else None
+        perspective_key = perspective.key if perspective else "_default"
+        # noinspection PyUnresolvedReferences
+        user = self.request.user
+        # noinspection PyUnresolvedReferences
+        variant = f"{perspective_key}:{self.request.get_full_path()}:{user.pk}:{get_language()}"
+        if self.row_cache_vary_on_permissions:
+            # 権限の取得はクエリになるため、指定したViewだけで行う
+            permissions = hashlib.md5(",".join(sorted(user.get_all_permissions())).encode()).hexdigest()
+            variant = f"{variant}:{permissions}"
+
+        return variant
+
+    # noinspection PyUnresolvedReferences
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if self.row_cache_version_field:
+            row_cache = RowFragmentCache(
+                self.row_cache_version_field, self.get_row_cache_variant(), timeout=self.row_cache_timeout
+            )
+            row_cache.prefetch(context["object_list"])
+            context["row_cache"] = row_cache
+
+        return context
+
+    # noinspection PyUnresolvedReferences
+    def render_to_response(self, context, **response_kwargs):
+        response = super().render_to_response(context, **response_kwargs)
+        row_cache = context.get("row_cache")
+        if row_cache:
+            # 描画後に、新しく描画した行をまとめて保存する
+            response.add_post_render_callback(lambda _: row_cache.flush())
+
+        return response
+
+
+class ConditionalGetMixin:
+    """ETag / Last-Modified による条件付きGETに対応するmixin
+
+    `last_modified_field`(例: "updated_at")を指定すると、MAX(last_modified_field)と件数を1回のクエリで取得し、
+    変更がなければ一覧や画面の組み立て前に304を返す。
+    モデルに `get_conditional_validators(queryset) -> dict` がある場合はそちらを使う
+    (dictの "last_modified" がLast-Modifiedヘッダーになり、全体がETagの元になる)。
+    """
+
+    last_modified_field = None
+
+    def get_conditional_queryset(self) -> Optional[QuerySet]:
+        # noinspection PyUnresolvedReferences
+        return self.get_queryset()
+
+    def get_conditional_validators(self) -> Optional[dict]:
+        queryset = self.get_conditional_queryset()
+        if queryset is None:
+            return None
+
+        if hasattr(queryset.model, "get_conditional_validators"):
+            return queryset.model.get_conditional_validators(queryset)
+
+        if not self.last_modified_field:
+            return None
+
+        return queryset.aggregate(last_modified=Max(self.last_modified_field), count=Count("pk"))
+
+    def get_etag(self, validators: dict) -> str:
+        # noinspection PyUnresolvedReferences
+        perspective = self.get_perspective() if hasattr(self, "get_perspective") else None
+        # noinspection PyUnresolvedReferences
+        request = self.request
+        source = repr(
+            (
+                f"{self.__class__.__module__}.{self.__class__.__qualname__}",
+                sorted(validators.items()),
+                perspective.key if perspective else "_default",
+                request.get_full_path(),
+                wants_json(request),
+                getattr(request.user, "pk", None),
+            )
+        )
+        return quote_etag(hashlib.md5(source.encode()).hexdigest())
+
+    def get_conditional_headers(self, request) -> Optional[Tuple[str, Optional[int]]]:
+        """ETagとLast-Modified(UNIXタイムスタンプ)を返す(条件付きGETの対象外の場合はNone)"""
+        validators = self.get_conditional_validators()
+        if validators is None:
+            return None
+
+        # 未表示のメッセージがある場合は、キャッシュさせない
+        if get_messages(request):
+            return None
+
+        last_modified = validators.get("last_modified")
+        timestamp = int(last_modified.timestamp()) if isinstance(last_modified, datetime) else None
+        return self.get_etag(validators), timestamp
+
+    @staticmethod
+    def set_conditional_headers(response: HttpResponse, etag: str, timestamp: Optional[int]):
+        if 200 <= response.status_code < 300:
+            response.headers.setdefault("ETag", etag)
+            if timestamp is not None:
+                response.headers.setdefault("Last-Modified", http_date(timestamp))
+
+    def get(self, request, *args, **kwargs):
+        headers = self.get_conditional_headers(request)
+        if headers is None:
+            # noinspection PyUnresolvedReferences
+            return super().get(request, *args, **kwargs)
+
+        etag, timestamp = headers
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response:
+            return response
+
+        # noinspection PyUnresolvedReferences
+        response = super().get(request, *args, **kwargs)
+        self.set_conditional_headers(response, etag, timestamp)
+        return response
+
+
+class JsonResponseMixin:
+    """JSON(`?format=json` または Accept: application/json)を要求されたときに、HTMLの代わりにJSONを返すmixin
+
+    コンテキストやナビゲーションバーは作らず、表示するフィールドだけを取得する。
+    一覧はストリーミングで返す。
+
+    画面に表示しない列を公開しないよう、`json_fields` を指定したViewだけがJSONを返す(未指定の場合は常にHTML)。
+    一覧は、ページングしている場合はHTMLと同じページ、していない場合は最大 `json_max_rows` 件を返す。
+    """
+
+    json_fields = None
+    json_max_rows = 1000
+
+    def get_json_fields(self, model) -> List[str]:
+        return list(self.json_fields)
+
+    def get_json_queryset(self) -> QuerySet:
+        # noinspection PyUnresolvedReferences
+        return self.limit_json_queryset(self.get_queryset())
+
+    # noinspection PyUnresolvedReferences
+    def limit_json_queryset(self, queryset: QuerySet) -> QuerySet:
+        # ページングしている場合はHTMLと同じページを返す
+        page_size = self.get_paginate_by(queryset) if hasattr(self, "get_paginate_by") else None
+        if page_size:
+            _, _, queryset, _ = self.paginate_queryset(queryset, page_size)
+            return queryset
+
+        return queryset[: self.json_max_rows]
+
+    def get_json_response(self) -> HttpResponse:
+        queryset = self.get_json_queryset()
+        rows = queryset.values(*self.get_json_fields(queryset.model)).iterator()
+        return StreamingHttpResponse(stream_json_list(rows), content_type=JSON_CONTENT_TYPE)
+
+    def get(self, request, *args, **kwargs):
+        if not self.json_fields:
+            # noinspection PyUnresolvedReferences
+            return super().get(request, *args, **kwargs)
+
+        if wants_json(request):
+            response = self.get_json_response()
+        else:
+            # noinspection PyUnresolvedReferences
+            response = super().get(request, *args, **kwargs)
+
+        patch_vary_headers(response, ("Accept",))
+        return response
+
+
+class SingleObjectJsonResponseMixin(JsonResponseMixin):
+    """1つのオブジェクトをJSONで返すmixin(DetailView用)
+
+    一覧と同じく values() で取得するため、`__` でたどった列や多対多も指定できる
+    (外部キーはIDのみ、多対多や逆参照は重複を除いた値のリストになる)。
+    """
+
+    # noinspection PyUnresolvedReferences
+    def get_json_response(self) -> HttpResponse:
+        queryset = self.get_queryset()
+        field_names = self.get_json_fields(queryset.model)
+        obj = self.get_object(queryset.only("pk"))
+
+        # 多対多などは、関連するレコードの数だけ行になる
+        rows = list(queryset.filter(pk=obj.pk).values(*field_names))
+        data = {}
+        for name in field_names:
+            if _is_multi_valued_path(queryset.model, name):
+                data[name] = [value for value in unique_everseen(row[name] for row in rows) if value is not None]
+            else:
+                data[name] = rows[0][name]
+
+        return HttpResponse(dumps(data), content_type=JSON_CONTENT_TYPE)
+
+
 class SuccessUrlMixin:
     """追加・編集・削除が成功したときの戻り先を決定するためのmixin"""
 
@@ -130,16 +393,13 @@ class SupportSuccessUrlMixin:
         # noinspection PyUnresolvedReferences
         next_param = self.request.POST.get("success_url")
 
-        try:
-            # 解決できるパスかどうかのチェック
-            resolve(remove_query_string(next_param))
-
-            # 解決できるパスの場合はそのまま返す
+        # 解決できるパスの場合はそのまま返す
+        if is_resolvable_url(next_param):
             return next_param
-        except Resolver404:
-            # 解決できないパスの場合はデフォルトに任せる
-            # noinspection PyUnresolvedReferences
-            return super().get_success_url()
+
+        # 解決できないパスの場合はデフォルトに任せる
+        # noinspection PyUnresolvedReferences
+        return super().get_success_url()
 
 
 class SupportNextUrlMixin:
@@ -147,27 +407,80 @@ class SupportNextUrlMixin:
         # noinspection PyUnresolvedReferences
         next_param = self.request.POST.get("next")
 
+        # 解決できるパスの場合はそのまま返す
+        if is_resolvable_url(next_param):
+            return next_param
+
+        # 解決できないパスの場合はデフォルトに任せる
+        # noinspection PyUnresolvedReferences
+        return super().get_redirect_url()
+
+
+def _is_multi_valued_path(model, key: str) -> bool:
+    """key(例: groups__name)が多対多や逆参照をたどるかどうか"""
+    for name in key.split("__"):
         try:
-            # 解決できるパスかどうかのチェック
-            resolve(next_param)
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # year などのtransform
+            return False
 
-            # 解決できるパスの場合はそのまま返す
-            return next_param
-        except Resolver404:
-            # 解決できないパスの場合はデフォルトに任せる
-            # noinspection PyUnresolvedReferences
-            return super().get_redirect_url()
+        if field.many_to_many or field.one_to_many:
+            return True
+        if not field.is_relation:
+            return False
+
+        model = field.related_model
+
+    return False
+
+
+def _resolve_column(instance, key: str):
+    """parent__name のように外部キーをたどって値を取得する(get_FOO_display、メソッドにも対応)"""
+    *relation_names, name = key.split("__")
+    obj = instance
+    for relation_name in relation_names:
+        obj = getattr(obj, relation_name)
+        if obj is None:
+            return None
+
+    display = getattr(obj, f"get_{name}_display", None)
+    value = display if display else getattr(obj, name)
+    return value() if callable(value) else value
 
 
 class DisplayAsTableMixin:
+    """一覧を表で表示するmixin
+
+    `list_columns` に (見出し, フィールド名) を並べると headers()/columns() はそれに従い、
+    querysetも表示するフィールドだけを取得する(only())。
+    アンカーやアクションのURLの生成に必要なフィールドは `list_extra_fields` に指定する。
+    """
+
+    list_columns = None  # type: Optional[Sequence[Tuple[str, str]]]
+    list_extra_fields = ()
+
     @staticmethod
     def display_as():
         return "table"
 
-    @staticmethod
-    def headers():
+    def headers(self):
+        if self.list_columns:
+            return [label for label, _ in self.list_columns]
+
         raise NotImplementedError("headers()を定義してください")  # pragma: no cover
 
-    @staticmethod
-    def columns(instance):
+    def columns(self, instance):
+        if self.list_columns:
+            return [_resolve_column(instance, key) for _, key in self.list_columns]
+
         raise NotImplementedError("columns(self, instance)を定義してください")  # pragma: no cover
+
+    # noinspection PyUnresolvedReferences
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.list_columns:
+            keys = [key for _, key in self.list_columns] + list(self.list_extra_fields)
+            queryset = qs_only(queryset, keys)
+
+        return queryset